@@ -3,22 +3,84 @@ Atmora Backend Application
 Flask app factory and configuration
 """
 
-from flask import Flask
+from flask import Flask, Response
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
+from flask_compress import Compress
+import importlib
+import orjson
 import os
 
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson so request.json parsing and jsonify
+    serialization run in C; NumPy scalars/arrays serialize natively"""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
+# Constant endpoint bodies, serialized once at import instead of per request
+_HEALTH_BODY = orjson.dumps({
+    'status': 'healthy',
+    'message': 'Atmora Backend API is running',
+    'version': '1.0.0'
+})
+
+_ROOT_BODY = orjson.dumps({
+    'message': 'Atmora Weather Analysis Backend',
+    'version': '1.0.0',
+    'endpoints': {
+        'health': '/api/health',
+        'weather_analysis': '/api/weather/analyze',
+        'weather_progress': '/api/weather/progress/<task_id>',
+        'weather_export': '/api/weather/export/<task_id>/<format>',
+        'weather_forecast': '/api/prediction/forecast',
+        'forecast_progress': '/api/prediction/progress/<task_id>',
+        'population_analyze': '/api/population/analyze',
+        'population_info': '/api/population/info'
+    }
+})
+
+# Declarative blueprint table: (module path, blueprint attribute, URL prefix).
+# Each module is imported only at registration, and a blueprint can be turned
+# off for a deployment/test run via DISABLE_<BLUEPRINT_NAME> in the env.
+BLUEPRINTS = [
+    ('app.routes.weather.controllers', 'weather_bp', '/api/weather'),
+    ('app.routes.prediction.controllers', 'prediction_bp', '/api/prediction'),
+    ('app.routes.population.controllers', 'population_bp', '/api/population'),
+]
+
 def create_app():
     """Create and configure the Flask application"""
     app = Flask(__name__)
-    
+    app.json = OrjsonProvider(app)
+
     app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')
     app.config['DEBUG'] = os.environ.get('FLASK_DEBUG', 'True').lower() == 'true'
-    
+    app.config['CORS_MAX_AGE'] = int(os.environ.get('CORS_MAX_AGE', 86400))
+    # Narrow to the SPA origin in production so responses stay cacheable
+    # per-origin and preflights are minimal
+    app.config['CORS_ORIGINS'] = os.environ.get('CORS_ORIGINS', '*')
+
+    # max_age lets browsers cache the OPTIONS preflight, so polling clients
+    # don't pay an extra round-trip on every cross-origin API call
     CORS(app,
-         resources={r"/api/*": {"origins": "*"}},
+         resources={r"/api/*": {"origins": app.config['CORS_ORIGINS'],
+                                "max_age": app.config['CORS_MAX_AGE']}},
          supports_credentials=True,
          allow_headers=["Content-Type", "Authorization", "Accept"],
          methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"])
+
+    # Large JSON payloads (density grids, base64 charts) compress 5-10x;
+    # small bodies like health checks are skipped via COMPRESS_MIN_SIZE
+    app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+    app.config['COMPRESS_MIN_SIZE'] = 1024
+    app.config['COMPRESS_LEVEL'] = 4
+    Compress(app)
     
     cache_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'cache')
     if not os.path.exists(cache_dir):
@@ -28,36 +90,18 @@ def create_app():
     if not os.path.exists(static_dir):
         os.makedirs(static_dir)
     
-    from .routes.weather.controllers import weather_bp
-    from .routes.prediction.controllers import prediction_bp
-    from .routes.population.controllers import population_bp
-    app.register_blueprint(weather_bp, url_prefix='/api/weather')
-    app.register_blueprint(prediction_bp, url_prefix='/api/prediction')
-    app.register_blueprint(population_bp, url_prefix='/api/population')
+    for module_path, attr, url_prefix in BLUEPRINTS:
+        if os.environ.get(f'DISABLE_{attr.upper()}'):
+            continue
+        module = importlib.import_module(module_path)
+        app.register_blueprint(getattr(module, attr), url_prefix=url_prefix)
     
     @app.route('/api/health')
     def health():
-        return {
-            'status': 'healthy',
-            'message': 'Atmora Backend API is running',
-            'version': '1.0.0'
-        }
-    
+        return Response(_HEALTH_BODY, mimetype='application/json')
+
     @app.route('/')
     def root():
-        return {
-            'message': 'Atmora Weather Analysis Backend',
-            'version': '1.0.0',
-            'endpoints': {
-                'health': '/api/health',
-                'weather_analysis': '/api/weather/analyze',
-                'weather_progress': '/api/weather/progress/<task_id>',
-                'weather_export': '/api/weather/export/<task_id>/<format>',
-                'weather_forecast': '/api/prediction/forecast',
-                'forecast_progress': '/api/prediction/progress/<task_id>',
-                'population_analyze': '/api/population/analyze',
-                'population_info': '/api/population/info'
-            }
-        }
-    
+        return Response(_ROOT_BODY, mimetype='application/json')
+
     return app
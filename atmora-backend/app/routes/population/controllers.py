@@ -3,9 +3,13 @@ Population Analysis Controller
 Handles population analysis requests for geographic areas
 """
 
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, Response, stream_with_context
 from datetime import datetime
 import logging
+import orjson
+import threading
+
+from app.utils.validation import validate_geometry
 
 population_bp = Blueprint('population', __name__)
 logger = logging.getLogger(__name__)
@@ -33,54 +37,11 @@ def analyze_population():
         
         geometry = data['geometry']
         geometry_type = geometry.get('type')
-        
-        if geometry_type not in ['circle', 'square', 'rectangle']:
-            return jsonify({'error': 'Invalid geometry type. Must be circle, square, or rectangle'}), 400
-        
-        # Validate circle geometry
-        if geometry_type == 'circle':
-            if 'center' not in geometry or 'radius' not in geometry:
-                return jsonify({'error': 'Circle geometry requires center and radius'}), 400
-            
-            center = geometry['center']
-            if 'lat' not in center or 'lon' not in center:
-                return jsonify({'error': 'Center requires lat and lon'}), 400
-            
-            try:
-                lat = float(center['lat'])
-                lon = float(center['lon'])
-                radius = float(geometry['radius'])
-                
-                if not (-90 <= lat <= 90):
-                    return jsonify({'error': 'Latitude must be between -90 and 90'}), 400
-                if not (-180 <= lon <= 180):
-                    return jsonify({'error': 'Longitude must be between -180 and 180'}), 400
-                if not (0.1 <= radius <= 1000):
-                    return jsonify({'error': 'Radius must be between 0.1 and 1000 km'}), 400
-                    
-            except (ValueError, TypeError):
-                return jsonify({'error': 'Invalid numeric values'}), 400
-        
-        # Validate rectangle/square geometry
-        elif geometry_type in ['square', 'rectangle']:
-            if 'bounds' not in geometry:
-                return jsonify({'error': f'{geometry_type.capitalize()} geometry requires bounds'}), 400
-            
-            bounds = geometry['bounds']
-            if not isinstance(bounds, list) or len(bounds) != 2:
-                return jsonify({'error': 'Bounds must be array of 2 points [[lat1, lon1], [lat2, lon2]]'}), 400
-            
-            try:
-                for point in bounds:
-                    if not isinstance(point, list) or len(point) != 2:
-                        return jsonify({'error': 'Each bound point must be [lat, lon]'}), 400
-                    lat, lon = float(point[0]), float(point[1])
-                    if not (-90 <= lat <= 90) or not (-180 <= lon <= 180):
-                        return jsonify({'error': 'Invalid coordinates in bounds'}), 400
-                        
-            except (ValueError, TypeError):
-                return jsonify({'error': 'Invalid numeric values in bounds'}), 400
-        
+
+        validation_error = validate_geometry(geometry)
+        if validation_error:
+            return jsonify({'error': validation_error}), 400
+
         # Import here to avoid circular imports
         from app.services.population_service import PopulationAnalyzer
         
@@ -103,21 +64,82 @@ def analyze_population():
         return jsonify(response)
         
     except Exception as e:
-        logger.error(f"❌ Population analysis error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ Population analysis error")
         return jsonify({'error': f'Unexpected error: {str(e)}'}), 500
 
 
+# Static part of the health body, serialized once; only the timestamp is
+# spliced in per request
+_HEALTH_STATIC = orjson.dumps({
+    'status': 'healthy',
+    'service': 'Atmora Population API',
+    'version': '1.0.0'
+})[:-1]
+
+
 @population_bp.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
-    return jsonify({
-        'status': 'healthy',
-        'service': 'Atmora Population API',
-        'version': '1.0.0',
-        'timestamp': datetime.now().isoformat()
-    })
+    body = _HEALTH_STATIC + b',"timestamp":"%s"}' % datetime.now().isoformat().encode()
+    return Response(body, mimetype='application/json')
+
+
+# Cache of fully serialized /density bodies; the heat map is deterministic
+# for identical (date, resolution) inputs. Each body is several MB, so the
+# cache is capped and the oldest entries are evicted first.
+_density_cache = {}
+_density_cache_lock = threading.Lock()
+_DENSITY_CACHE_MAX = 64
+
+# Rows per streamed JSON fragment - keeps encode buffers small while the
+# client can already start parsing
+_DENSITY_CHUNK_ROWS = 8192
+
+
+def _density_body_parts(date_str, resolution):
+    """
+    Yield the serialized /density response for a (date, resolution) pair
+    as JSON byte fragments: header, data rows in chunks, then footer.
+    """
+    from app.services.population_service import PopulationAnalyzer
+    service = PopulationAnalyzer()
+
+    logger.info(f"🌍 Generating global density map for {date_str}")
+
+    # Generate density data (returns (N, 3) float32 array of [lat, lon, intensity])
+    heat_map_data = service.get_global_population_density(date_str, int(resolution))
+    total_points = len(heat_map_data)
+
+    head = {
+        'success': True,
+        'date': date_str,
+        'year': int(date_str[:4])
+    }
+    tail = {
+        'statistics': {
+            'total_points': total_points,
+            'description': 'Global population density heat map'
+        },
+        'metadata': {
+            'resolution': resolution,
+            'data_points': total_points,
+            'intensity_range': [0.0, 1.0],
+            'color_scale': {
+                'low': 'blue (low density)',
+                'medium': 'yellow (medium density)',
+                'high': 'red (high density)'
+            }
+        }
+    }
+
+    yield orjson.dumps(head)[:-1] + b',"data":['
+    for start in range(0, total_points, _DENSITY_CHUNK_ROWS):
+        rows = heat_map_data[start:start + _DENSITY_CHUNK_ROWS]
+        chunk = orjson.dumps(rows, option=orjson.OPT_SERIALIZE_NUMPY)[1:-1]
+        yield (b',' if start else b'') + chunk
+    yield b'],' + orjson.dumps(tail)[1:]
+
+    logger.info(f"✅ Generated {total_points} density points")
 
 
 @population_bp.route('/density', methods=['POST'])
@@ -146,47 +168,42 @@ def get_global_density():
         if not (0.5 <= resolution <= 10.0):
             return jsonify({'error': 'Resolution must be between 0.5 and 10.0 degrees'}), 400
         
-        logger.info(f"🌍 Generating global density map for {target_date.strftime('%Y-%m-%d')}")
-        
-        # Use existing population service
-        from app.services.population_service import PopulationAnalyzer
-        service = PopulationAnalyzer()
-        
-        # Generate density data (returns list of [lat, lon, intensity] directly)
-        heat_map_data = service.get_global_population_density(
-            target_date.strftime('%Y-%m-%d'), 
-            int(resolution)
-        )
-        
-        response = {
-            'success': True,
-            'date': target_date.strftime('%Y-%m-%d'),
-            'year': target_date.year,
-            'data': heat_map_data,
-            'statistics': {
-                'total_points': len(heat_map_data),
-                'description': 'Global population density heat map'
-            },
-            'metadata': {
-                'resolution': resolution,
-                'data_points': len(heat_map_data),
-                'intensity_range': [0.0, 1.0],
-                'color_scale': {
-                    'low': 'blue (low density)',
-                    'medium': 'yellow (medium density)',
-                    'high': 'red (high density)'
-                }
-            }
-        }
-        
-        logger.info(f"✅ Generated {len(heat_map_data)} density points")
-        
-        return jsonify(response)
-        
+        # The map only changes with its (date, resolution) inputs, so let
+        # browsers/CDNs reuse it too. Generation truncates the resolution
+        # to whole degrees (never below 1, so sub-degree requests don't
+        # divide by zero), so the key does the same - 2.0 and 2.0001
+        # share one entry instead of caching identical bodies twice
+        headers = {'Cache-Control': 'public, max-age=3600'}
+        cache_key = (target_date.strftime('%Y-%m-%d'), max(1, int(resolution)))
+
+        body = _density_cache.get(cache_key)
+        if body is not None:
+            return Response(body, mimetype='application/json', headers=headers)
+
+        # The grid is built before the first fragment comes out, so pull
+        # that first fragment here inside the try block - generation
+        # failures become a clean 500 instead of an aborted stream
+        parts_iter = _density_body_parts(*cache_key)
+        first_part = next(parts_iter)
+
+        def generate():
+            # Stream fragments to the client while accumulating them so
+            # warm requests get the fully cached body
+            parts = [first_part]
+            yield first_part
+            for part in parts_iter:
+                parts.append(part)
+                yield part
+            with _density_cache_lock:
+                while len(_density_cache) >= _DENSITY_CACHE_MAX:
+                    _density_cache.pop(next(iter(_density_cache)))
+                _density_cache[cache_key] = b''.join(parts)
+
+        return Response(stream_with_context(generate()),
+                        mimetype='application/json', headers=headers)
+
     except Exception as e:
-        logger.error(f"❌ Global density error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ Global density error")
         return jsonify({'error': f'Unexpected error: {str(e)}'}), 500
 
 
@@ -3,26 +3,233 @@ Prediction Routes
 Weather forecasting endpoints
 """
 
-from flask import Blueprint, request, jsonify
-from datetime import datetime
+from flask import Blueprint, request, jsonify, Response
+from datetime import date
+from collections import Counter
+import numpy as np
+import orjson
+import atexit
+import base64
+import hashlib
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import logging
+import os
 import threading
 import uuid
 import time
-from app.services.prediction_service import predict_weather, PredictionResult
+
+from app.utils.tasks import TaskStore
 
 prediction_bp = Blueprint('prediction', __name__)
+logger = logging.getLogger(__name__)
+
+
+@functools.lru_cache(maxsize=1)
+def _load_prediction_service():
+    """Import the heavy prediction stack (pandas/sklearn) on first use
+    so blueprint import and /health stay fast"""
+    from app.services.prediction_service import predict_weather
+    return predict_weather
+
+
+active_predictions = TaskStore(ttl_seconds=3600)
+
+# Shared worker pool for prediction jobs - bounds concurrent model runs
+# instead of spawning an unbounded OS thread per /forecast request
+prediction_executor = ThreadPoolExecutor(
+    max_workers=int(os.environ.get('FORECAST_WORKERS', os.cpu_count() or 4)))
+atexit.register(prediction_executor.shutdown, wait=False, cancel_futures=True)
+
+
+# Finished results keyed by a content hash of the request body, so an
+# identical POST (double-click, page reload) completes instantly from
+# cache instead of re-running the NASA fetch + model fit
+_result_cache = TaskStore(ttl_seconds=86400)
+
+
+def _request_hash(data):
+    """Canonical 128-bit digest of a forecast payload (key-order independent)"""
+    return hashlib.blake2b(
+        orjson.dumps(data, option=orjson.OPT_SORT_KEYS),
+        digest_size=16).hexdigest()
+
+
+def _store_result(req_hash, tracker):
+    """Done-callback: publish a successful result under its request hash"""
+    if tracker.result is not None:
+        _result_cache[req_hash] = tracker.result
+
+
+# Singleflight map: canonical request key -> task_id of the in-flight
+# prediction, so concurrent identical requests attach to one job instead
+# of each running its own NASA fetch + model fit
+_inflight = {}
+_inflight_lock = threading.Lock()
 
-active_predictions = {}
+
+def _clear_inflight(key, task_id):
+    """Drop a finished task from the singleflight map (done-callback)"""
+    with _inflight_lock:
+        if _inflight.get(key) == task_id:
+            del _inflight[key]
+
+
+# Pre-warm loop: the NASA POWER cache in prediction_service holds a tile
+# for 24h, so re-fetching the most-requested tiles every 2h keeps the
+# interactive /forecast path on a warm cache for popular locations.
+_TILE_DEG = 0.25  # keep in sync with prediction_service._POWER_GRID_DEG
+_PREWARM_INTERVAL = int(os.environ.get('PREWARM_INTERVAL', 2 * 3600))
+_PREWARM_TOP_N = 10
+_tile_hits = Counter()
+_tile_hits_lock = threading.Lock()
+_prewarm_stop = threading.Event()
+_prewarm_started = False
+atexit.register(_prewarm_stop.set)
+
+
+def _record_tile_hit(lat, lon):
+    """Count a request against its NASA grid tile and ensure the pre-warm
+    loop is running"""
+    global _prewarm_started
+    tile = (round(lat / _TILE_DEG) * _TILE_DEG,
+            round(lon / _TILE_DEG) * _TILE_DEG)
+    with _tile_hits_lock:
+        _tile_hits[tile] += 1
+        if not _prewarm_started:
+            _prewarm_started = True
+            threading.Thread(target=_prewarm_popular, daemon=True).start()
+
+
+def _prewarm_popular():
+    """Periodically refresh the NASA POWER cache for the hottest tiles"""
+    while not _prewarm_stop.wait(_PREWARM_INTERVAL):
+        with _tile_hits_lock:
+            top = _tile_hits.most_common(_PREWARM_TOP_N)
+        for (lat, lon), hits in top:
+            try:
+                from app.services.prediction_service import fetch_historical_data_dynamic
+                fetch_historical_data_dynamic(lat, lon, years=10)
+                logger.debug(f"Pre-warmed NASA tile ({lat}, {lon}) ({hits} hits)")
+            except Exception as e:
+                logger.debug(f"Pre-warm skipped for ({lat}, {lon}): {e}")
 
 
 class PredictionTracker:
+    # Many trackers can be alive at once (batches, TTL'd history);
+    # slots drop the per-instance __dict__ and speed up the attribute
+    # reads in the hot /progress path
+    __slots__ = ('task_id', 'progress', 'status', 'result', 'error',
+                 'start_time', 'future', 'completed_body', 'chart_png',
+                 'chart_etag')
+
     def __init__(self, task_id):
         self.task_id = task_id
         self.progress = 0
         self.status = "starting"
         self.result = None
         self.error = None
-        self.start_time = time.time()
+        # Monotonic so elapsed time can't go negative on NTP clock steps
+        self.start_time = time.monotonic()
+        self.future = None
+        # Completed /progress body, serialized exactly once - polls after
+        # completion replay these bytes instead of re-encoding the result
+        self.completed_body = None
+        # Chart decoded from base64 once, with its ETag, for /chart
+        self.chart_png = None
+        self.chart_etag = None
+
+
+# Prediction window bounds, parsed once - training data ends 2024-12-31
+# and accuracy degrades beyond a year out
+_TRAINING_END = date(2024, 12, 31)
+_MAX_PREDICTION_DATE = date(2025, 12, 31)
+
+
+def _validate_forecast_payload(data):
+    """Validate one forecast payload; returns an error string or None"""
+    required_fields = ['latitude', 'longitude', 'targetDate']
+    for field in required_fields:
+        if field not in data:
+            return f'Eksik alan: {field}'
+
+    try:
+        lat = float(data['latitude'])
+        lon = float(data['longitude'])
+
+        if not (-90 <= lat <= 90):
+            return 'Latitude must be between -90 and 90'
+        if not (-180 <= lon <= 180):
+            return 'Longitude must be between -180 and 180'
+    except (ValueError, TypeError):
+        return 'Invalid coordinate values'
+
+    try:
+        # fromisoformat is C-implemented, ~3x faster than strptime
+        target_date = date.fromisoformat(data['targetDate'])
+
+        if target_date <= _TRAINING_END:
+            return 'Hedef tarih 2025-01-01 veya sonrası olmalıdır (eğitim verisi 2024-12-31\'de bitiyor)'
+
+        if target_date > _MAX_PREDICTION_DATE:
+            return 'Target date cannot exceed 2025-12-31 (for reasonable accuracy)'
+
+    except (ValueError, TypeError):
+        return 'Invalid date format. Use YYYY-MM-DD'
+
+    horizon = data.get('horizon', 1)
+    if not isinstance(horizon, int) or not (1 <= horizon <= 30):
+        return 'Horizon must be an integer between 1 and 30'
+
+    return None
+
+
+def _start_forecast(data):
+    """Record the tile hit, apply singleflight dedup and submit the job.
+    Returns the task_id serving this payload (new or already in flight)."""
+    lat = float(data['latitude'])
+    lon = float(data['longitude'])
+    horizon = data.get('horizon', 1)
+
+    _record_tile_hit(lat, lon)
+
+    # Identical request body already answered within the cache TTL: hand
+    # back a tracker that is born completed, so the normal polling flow
+    # resolves on its first /progress call
+    req_hash = _request_hash(data)
+    if req_hash in _result_cache:
+        task_id = str(uuid.uuid4())
+        tracker = PredictionTracker(task_id)
+        tracker.result = _result_cache[req_hash]
+        tracker.progress = 100
+        tracker.status = "completed"
+        active_predictions[task_id] = tracker
+        return task_id
+
+    dedup_key = (round(lat, 2), round(lon, 2), data['targetDate'],
+                 horizon, data.get('use_dynamic_data', True),
+                 data.get('climate_type', 'mediterranean'))
+
+    with _inflight_lock:
+        existing_id = _inflight.get(dedup_key)
+        if existing_id and existing_id in active_predictions:
+            existing = active_predictions[existing_id]
+            if existing.result is None and existing.error is None:
+                # Same request already running - attach this caller to it
+                return existing_id
+
+        task_id = str(uuid.uuid4())
+        tracker = PredictionTracker(task_id)
+        active_predictions[task_id] = tracker
+        _inflight[dedup_key] = task_id
+
+    tracker.future = prediction_executor.submit(process_prediction, data, tracker)
+    tracker.future.add_done_callback(
+        lambda _f, k=dedup_key, tid=task_id: _clear_inflight(k, tid))
+    tracker.future.add_done_callback(
+        lambda _f, h=req_hash, t=tracker: _store_result(h, t))
+    return task_id
 
 
 @prediction_bp.route('/forecast', methods=['POST'])
@@ -37,173 +244,228 @@ def forecast_weather():
         "horizon": int (optional, default 1),
         "use_dynamic_data": bool (optional, default True)
     }
-    
+
     Data modes:
     - use_dynamic_data=True: Fetches 10 years of location-specific data from NASA POWER API (~3-10s)
     - use_dynamic_data=False: Uses pre-collected regional climate data (faster, less accurate)
     """
     try:
         data = request.json
-        
-        required_fields = ['latitude', 'longitude', 'targetDate']
-        for field in required_fields:
-            if field not in data:
-                return jsonify({'error': f'Eksik alan: {field}'}), 400
-        
-        try:
-            lat = float(data['latitude'])
-            lon = float(data['longitude'])
-            
-            if not (-90 <= lat <= 90):
-                return jsonify({'error': 'Latitude must be between -90 and 90'}), 400
-            if not (-180 <= lon <= 180):
-                return jsonify({'error': 'Longitude must be between -180 and 180'}), 400
-        except (ValueError, TypeError):
-            return jsonify({'error': 'Invalid coordinate values'}), 400
-        
-        try:
-            target_date = datetime.strptime(data['targetDate'], '%Y-%m-%d')
-            
-            training_end_date = datetime(2024, 12, 31)
-            if target_date <= training_end_date:
-                return jsonify({'error': 'Hedef tarih 2025-01-01 veya sonrası olmalıdır (eğitim verisi 2024-12-31\'de bitiyor)'}), 400
-            
-            max_prediction_date = datetime(2025, 12, 31)
-            if target_date > max_prediction_date:
-                return jsonify({'error': 'Target date cannot exceed 2025-12-31 (for reasonable accuracy)'}), 400
-                
-        except ValueError:
-            return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
-        
-        horizon = data.get('horizon', 1)
-        
-        task_id = str(uuid.uuid4())
-        
-        tracker = PredictionTracker(task_id)
-        active_predictions[task_id] = tracker
-        
-        thread = threading.Thread(
-            target=process_prediction,
-            args=(data, tracker)
-        )
-        thread.daemon = True
-        thread.start()
-        
+
+        error = _validate_forecast_payload(data)
+        if error:
+            return jsonify({'error': error}), 400
+
+        task_id = _start_forecast(data)
+
         return jsonify({
             'task_id': task_id,
             'status': 'started',
             'message': 'Weather prediction initiated'
         })
-        
+
     except Exception as e:
         return jsonify({'error': f'Unexpected error: {str(e)}'}), 500
 
 
+# Batch requests cap - a grid of locations should be one HTTP call, not
+# an unbounded one
+_BATCH_MAX_REQUESTS = 50
+
+# group_id -> list of task_ids, expiring alongside their trackers
+_batch_groups = TaskStore(ttl_seconds=3600)
+
+
+@prediction_bp.route('/forecast/batch', methods=['POST'])
+def forecast_batch():
+    """
+    Start predictions for several locations in one HTTP round-trip
+    Expected JSON payload:
+    {
+        "requests": [<forecast payload>, ...]   (max 50)
+    }
+    Duplicate payloads inside the batch coalesce onto one task.
+    """
+    try:
+        data = request.json
+
+        payloads = data.get('requests') if data else None
+        if not isinstance(payloads, list) or not payloads:
+            return jsonify({'error': 'requests must be a non-empty array'}), 400
+
+        if len(payloads) > _BATCH_MAX_REQUESTS:
+            return jsonify({'error': f'At most {_BATCH_MAX_REQUESTS} requests per batch'}), 413
+
+        for i, payload in enumerate(payloads):
+            error = _validate_forecast_payload(payload)
+            if error:
+                return jsonify({'error': error, 'index': i}), 400
+
+        task_ids = [_start_forecast(payload) for payload in payloads]
+
+        group_id = str(uuid.uuid4())
+        _batch_groups[group_id] = task_ids
+
+        return jsonify({
+            'group_id': group_id,
+            'task_ids': task_ids,
+            'status': 'started',
+            'message': f'{len(task_ids)} predictions initiated'
+        })
+
+    except Exception as e:
+        return jsonify({'error': f'Unexpected error: {str(e)}'}), 500
+
+
+@prediction_bp.route('/forecast/batch/progress/<group_id>', methods=['GET'])
+def get_batch_progress(group_id):
+    """Aggregate progress for a batch of predictions"""
+    if group_id not in _batch_groups:
+        return jsonify({'error': 'Batch not found'}), 404
+
+    task_ids = _batch_groups[group_id]
+    completed = 0
+    errors = 0
+    for task_id in task_ids:
+        if task_id not in active_predictions:
+            continue
+        tracker = active_predictions[task_id]
+        if tracker.result is not None:
+            completed += 1
+        elif tracker.error is not None:
+            errors += 1
+
+    resp = jsonify({
+        'group_id': group_id,
+        'total': len(task_ids),
+        'completed': completed,
+        'errors': errors,
+        'task_ids': task_ids
+    })
+    resp.headers['Cache-Control'] = 'no-store'
+    return resp
+
+
+def run_forecast(data, report_progress):
+    """Run one forecast end to end and return the response payload.
+
+    Task-shaped: takes only the request payload plus a
+    ``report_progress(progress, status)`` callback and returns a plain dict,
+    so it could be registered with a distributed queue (e.g. a Celery task
+    whose callback maps onto ``self.update_state``) without touching the
+    prediction logic. The in-process executor below is the only runner we
+    need while the app deploys as a single process.
+    """
+    use_dynamic = data.get('use_dynamic_data', True)
+
+    if use_dynamic:
+        report_progress(10, "Fetching 10 years of data from NASA POWER API...")
+    else:
+        report_progress(10, "Loading Mediterranean climate data (4 years)")
+
+    predict_weather = _load_prediction_service()
+    result = predict_weather(
+        data['latitude'],
+        data['longitude'],
+        data['targetDate'],
+        horizon=data.get('horizon', 1),
+        climate_type=data.get('climate_type', 'mediterranean'),
+        use_dynamic_data=use_dynamic
+    )
+
+    report_progress(90, "Preparing results")
+
+    prediction_summary = create_prediction_summary(result)
+
+    return {
+        'predictions': result.predictions,
+        'accuracy_score': result.accuracy_score,
+        'confidence_level': result.confidence_level,
+        'days_from_2024': result.days_from_2024,
+        'target_date': result.target_date,
+        'location': result.location,
+        'summary': prediction_summary,
+        'chart': result.chart
+    }
+
+
 def process_prediction(data, tracker):
-    """Background task for processing prediction"""
+    """Background task runner: maps run_forecast onto a tracker"""
+    def report_progress(progress, status):
+        tracker.progress = progress
+        tracker.status = status
+
     try:
-        use_dynamic = data.get('use_dynamic_data', True)
-        
-        if use_dynamic:
-            tracker.status = "Fetching 10 years of data from NASA POWER API..."
-        else:
-            tracker.status = "Loading Mediterranean climate data (4 years)"
-        
-        tracker.progress = 10
-        
-        result = predict_weather(
-            data['latitude'],
-            data['longitude'],
-            data['targetDate'],
-            horizon=data.get('horizon', 1),
-            climate_type=data.get('climate_type', 'mediterranean'),
-            use_dynamic_data=use_dynamic
-        )
-        
-        tracker.progress = 90
-        tracker.status = "Preparing results"
-        
-        prediction_summary = create_prediction_summary(result)
-        
-        tracker.result = {
-            'predictions': result.predictions,
-            'accuracy_score': result.accuracy_score,
-            'confidence_level': result.confidence_level,
-            'days_from_2024': result.days_from_2024,
-            'target_date': result.target_date,
-            'location': result.location,
-            'summary': prediction_summary,
-            'chart': result.chart
-        }
+        tracker.result = run_forecast(data, report_progress)
         tracker.progress = 100
         tracker.status = "completed"
-        
+
         print(f"✅ Prediction {tracker.task_id} completed")
-        
+
     except Exception as e:
         tracker.error = str(e)
         tracker.status = "error"
         print(f"❌ Prediction {tracker.task_id} errorsı: {e}")
+    finally:
+        # Restart the TTL clock at completion so the result stays
+        # retrievable for a full hour even after a long-running job
+        active_predictions.touch(tracker.task_id)
+
+
+# Classification tables: sorted thresholds plus one more label than
+# thresholds, looked up with a single binary search instead of an if-ladder
+_TEMP_BINS = (10, 20, 30)
+_TEMP_LABELS = ("cold", "cool", "warm", "very hot")
+_WIND_BINS = (8, 15)
+_WIND_LABELS = ("calm", "windy", "very windy")
+_PRECIP_BINS = (2, 10)
+_PRECIP_LABELS = ("dry", "light rain", "rainy")
+_ACCURACY_BINS = (50, 80)
+_ACCURACY_COLORS = ("red", "yellow", "green")
 
 
-def create_prediction_summary(result: PredictionResult) -> dict:
+def create_prediction_summary(result) -> dict:
     """Create user-friendly summary"""
     if not result.predictions:
         return {}
-    
+
     pred = result.predictions[0]
-    
+
     temp = pred['temperature']
-    if temp > 30:
-        temp_desc = "very hot"
-    elif temp > 20:
-        temp_desc = "warm"
-    elif temp > 10:
-        temp_desc = "cool"
-    else:
-        temp_desc = "cold"
-    
+    temp_desc = _TEMP_LABELS[bisect_left(_TEMP_BINS, temp)]
+
     wind = pred['wind_speed']
-    if wind > 15:
-        wind_desc = "very windy"
-    elif wind > 8:
-        wind_desc = "windy"
-    else:
-        wind_desc = "calm"
-    
+    wind_desc = _WIND_LABELS[bisect_left(_WIND_BINS, wind)]
+
     precip = pred['precipitation']
-    if precip > 10:
-        precip_desc = "rainy"
-    elif precip > 2:
-        precip_desc = "light rain"
-    else:
-        precip_desc = "dry"
-    
-    if result.accuracy_score >= 80:
-        accuracy_color = "green"
-    elif result.accuracy_score >= 50:
-        accuracy_color = "yellow"
-    else:
-        accuracy_color = "red"
-    
+    precip_desc = _PRECIP_LABELS[bisect_left(_PRECIP_BINS, precip)]
+
+    # bisect_right because the original ladder used >= for accuracy
+    accuracy_color = _ACCURACY_COLORS[bisect_right(_ACCURACY_BINS, result.accuracy_score)]
+
+    # One vectorized rounding pass instead of a round() call per metric;
+    # scales to multi-day horizons without extra Python-level calls
+    temp_r, wind_r, precip_r, humidity_r = np.round(
+        [temp, wind, precip, pred['humidity']], 1).tolist()
+
     return {
         'temperature': {
-            'value': round(temp, 1),
+            'value': temp_r,
             'description': temp_desc,
             'unit': '°C'
         },
         'wind_speed': {
-            'value': round(wind, 1),
+            'value': wind_r,
             'description': wind_desc,
             'unit': 'm/s'
         },
         'precipitation': {
-            'value': round(precip, 1),
+            'value': precip_r,
             'description': precip_desc,
             'unit': 'mm'
         },
         'humidity': {
-            'value': round(pred['humidity'], 1),
+            'value': humidity_r,
             'unit': '%'
         },
         'overall_condition': f"{temp_desc}, {wind_desc}, {precip_desc}",
@@ -233,23 +495,86 @@ def get_prediction_progress(task_id):
         return jsonify({'error': 'Task not found'}), 404
     
     tracker = active_predictions[task_id]
-    
+
+    # The full result is serialized exactly once; every poll after
+    # completion replays the same bytes, so coalesced callers sharing a
+    # task_id all receive the payload
+    if tracker.completed_body is not None:
+        return Response(tracker.completed_body, mimetype='application/json',
+                        headers={'Cache-Control': 'no-store'})
+
     response = {
         'task_id': task_id,
         'progress': tracker.progress,
         'status': tracker.status,
-        'elapsed_time': int(time.time() - tracker.start_time)
+        'elapsed_time': int(time.monotonic() - tracker.start_time)
     }
-    
+
     if tracker.result:
         response['completed'] = True
         response['result'] = tracker.result
-    
+        tracker.completed_body = orjson.dumps(
+            response, option=orjson.OPT_SERIALIZE_NUMPY)
+        return Response(tracker.completed_body, mimetype='application/json',
+                        headers={'Cache-Control': 'no-store'})
+
     if tracker.error:
         response['error'] = tracker.error
         response['completed'] = False
-    
-    return jsonify(response)
+
+    resp = jsonify(response)
+    # Polled every second - never let an intermediary cache a stale state
+    resp.headers['Cache-Control'] = 'no-store'
+    return resp
+
+
+@prediction_bp.route('/result/<task_id>', methods=['GET'])
+def get_prediction_result(task_id):
+    """Get full results of a completed prediction (progress polls can then
+    stay lightweight for clients that use this endpoint)"""
+    if task_id not in active_predictions:
+        return jsonify({'error': 'Task not found'}), 404
+
+    tracker = active_predictions[task_id]
+
+    if tracker.error:
+        return jsonify({'error': tracker.error}), 500
+
+    if not tracker.result:
+        return jsonify({'error': 'Prediction has not been completed yet'}), 400
+
+    return jsonify({
+        'task_id': task_id,
+        'status': 'completed',
+        'result': tracker.result
+    })
+
+
+@prediction_bp.route('/chart/<task_id>', methods=['GET'])
+def get_prediction_chart(task_id):
+    """Serve the forecast chart as a PNG instead of base64-inside-JSON -
+    raw image bytes are ~25% smaller and browser-cacheable"""
+    if task_id not in active_predictions:
+        return jsonify({'error': 'Task not found'}), 404
+
+    tracker = active_predictions[task_id]
+
+    if not tracker.result or not tracker.result.get('chart'):
+        return jsonify({'error': 'Chart is not available yet'}), 404
+
+    if tracker.chart_png is None:
+        tracker.chart_png = base64.b64decode(tracker.result['chart'])
+        tracker.chart_etag = hashlib.blake2b(
+            tracker.chart_png, digest_size=16).hexdigest()
+
+    # The chart never changes for a finished task - let revalidating
+    # clients skip the transfer entirely
+    if tracker.chart_etag in request.if_none_match:
+        return Response(status=304)
+
+    return Response(tracker.chart_png, mimetype='image/png',
+                    headers={'Cache-Control': 'private, max-age=3600',
+                             'ETag': tracker.chart_etag})
 
 
 @prediction_bp.route('/cleanup/<task_id>', methods=['DELETE'])
@@ -279,9 +604,18 @@ def accuracy_test():
         
         if 'latitude' not in data or 'longitude' not in data:
             return jsonify({'error': 'Latitude and longitude are required'}), 400
-        
-        lat = float(data['latitude'])
-        lon = float(data['longitude'])
+
+        try:
+            lat = float(data['latitude'])
+            lon = float(data['longitude'])
+
+            if not (-90 <= lat <= 90):
+                return jsonify({'error': 'Latitude must be between -90 and 90'}), 400
+            if not (-180 <= lon <= 180):
+                return jsonify({'error': 'Longitude must be between -180 and 180'}), 400
+        except (ValueError, TypeError):
+            return jsonify({'error': 'Invalid coordinate values'}), 400
+
         test_months = data.get('test_months', 3)
         use_dynamic = data.get('use_dynamic_data', True)
         
@@ -296,18 +630,21 @@ def accuracy_test():
             return jsonify({'error': result.get('error', 'Test failed')}), 500
             
     except Exception as e:
-        print(f"❌ Accuracy test error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ Accuracy test error")
         return jsonify({'error': str(e)}), 500
 
 
+# Static part of the health body, serialized once; only the task counter
+# is spliced in per request
+_HEALTH_STATIC = orjson.dumps({
+    'status': 'healthy',
+    'service': 'Atmora Prediction API',
+    'version': '1.0.0'
+})[:-1]
+
+
 @prediction_bp.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
-    return jsonify({
-        'status': 'healthy',
-        'service': 'Atmora Prediction API',
-        'version': '1.0.0',
-        'active_tasks': len(active_predictions)
-    })
+    body = _HEALTH_STATIC + b',"active_tasks":%d}' % len(active_predictions)
+    return Response(body, mimetype='application/json')
@@ -3,22 +3,40 @@ Weather Analysis Controller
 Handles weather analysis requests and data processing
 """
 
-from flask import Blueprint, request, jsonify, send_file
-from app.services.nasa_weather_service import get_point_data_for_period, create_weather_charts
-import threading
+from flask import Blueprint, request, jsonify, Response, stream_with_context
+import atexit
 import uuid
 import time
-import json
 import csv
-import tempfile
+import io
+import numpy as np
+import orjson
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+import logging
+
+from app.utils.tasks import TaskStore
+
 weather_bp = Blueprint('weather', __name__)
+logger = logging.getLogger(__name__)
 
-active_tasks = {}
+# TTL-evicting store, so tasks whose clients never call /cleanup are
+# garbage collected instead of accumulating for the life of the worker
+active_tasks = TaskStore(ttl_seconds=3600)
+
+# Shared worker pool: bounds concurrent NASA downloads + chart renders
+# instead of spawning an unbounded OS thread per /analyze request
+weather_executor = ThreadPoolExecutor(
+    max_workers=int(os.environ.get('WEATHER_WORKERS', 8)))
+atexit.register(weather_executor.shutdown, wait=False, cancel_futures=True)
 
 class ProgressTracker:
+    # Clients poll at ~1s; flushing tracker updates more often than 4x/s
+    # just burns cycles in the fetch loop
+    MIN_UPDATE_INTERVAL = 0.25
+
     def __init__(self, task_id):
         self.task_id = task_id
         self.progress = 0
@@ -26,12 +44,39 @@ class ProgressTracker:
         self.status = "starting"
         self.result = None
         self.error = None
+        # Column-oriented view of result['all_data'], built once at
+        # completion and shared by the summary and export paths
+        self.arrays = None
         self.start_time = time.time()
+        self.future = None
+        self._last_flush = 0.0
+        # Immutable-by-convention dict swapped in as a single reference
+        # assignment, so pollers never see progress from one update paired
+        # with the total/status of another
+        self.snapshot = {'progress': 0, 'total': 0, 'status': 'starting'}
+
+    def set_status(self, status):
+        self.status = status
+        self._publish()
 
     def update(self, current, total):
+        # Coalesce the per-iteration callbacks from the NASA fetch loop;
+        # the final update always lands so 100% is never skipped
+        now = time.monotonic()
+        if current != total and now - self._last_flush < self.MIN_UPDATE_INTERVAL:
+            return
+        self._last_flush = now
         self.progress = current
         self.total = total
         self.status = f"{current}/{total} completed"
+        self._publish()
+
+    def _publish(self):
+        self.snapshot = {
+            'progress': self.progress,
+            'total': self.total,
+            'status': self.status,
+        }
 
 @weather_bp.route('/analyze', methods=['POST'])
 def analyze_weather():
@@ -83,12 +128,7 @@ def analyze_weather():
         tracker = ProgressTracker(task_id)
         active_tasks[task_id] = tracker
         
-        thread = threading.Thread(
-            target=process_weather_data,
-            args=(data, tracker)
-        )
-        thread.daemon = True
-        thread.start()
+        tracker.future = weather_executor.submit(process_weather_data, data, tracker)
         
         return jsonify({
             'task_id': task_id,
@@ -102,7 +142,10 @@ def analyze_weather():
 def process_weather_data(data, tracker):
     """Background task for processing weather data"""
     try:
-        tracker.status = "Data collection from NASA API's starting"
+        # Lazy import keeps matplotlib/numpy off the blueprint import path
+        from app.services.nasa_weather_service import get_point_data_for_period, create_weather_charts
+
+        tracker.set_status("Data collection from NASA API's starting")
         
         result = get_point_data_for_period(
             data['latitude'], data['longitude'],
@@ -110,28 +153,57 @@ def process_weather_data(data, tracker):
             progress_callback=tracker.update
         )
         
-        tracker.status = "Creating graphics"
+        tracker.set_status("Creating graphics")
         
         charts = create_weather_charts(result)
         result['charts'] = charts
-        
-        summary = create_user_summary(result)
+
+        tracker.arrays = _build_data_arrays(result['all_data'])
+
+        summary = create_user_summary(result, arrays=tracker.arrays)
         result['summary'] = summary
         
         tracker.result = result
-        tracker.status = "completed"
-        
-        print(f"✅ Task {tracker.task_id} completed: {len(result['all_data'])} veri noktası")
-        
+        tracker.set_status("completed")
+
+        logger.info(f"✅ Task {tracker.task_id} completed: {len(result['all_data'])} veri noktası")
+
     except Exception as e:
         tracker.error = str(e)
-        tracker.status = "error"
-        print(f"❌ Task {tracker.task_id} errorsı: {e}")
+        tracker.set_status("error")
+        logger.exception(f"❌ Task {tracker.task_id} failed")
+    finally:
+        # Restart the TTL clock at completion so results of long analyses
+        # stay retrievable/exportable for a full hour
+        active_tasks.touch(tracker.task_id)
+
+def _build_data_arrays(all_data):
+    """Convert the per-day dict rows to a dict of NumPy columns.
+
+    One conversion pass feeds every array consumer (summary totals, CSV
+    export) instead of each of them re-looping over N dicts.
+    """
+    n = len(all_data)
+    return {
+        'date': [d['date'] for d in all_data],
+        'lat': np.fromiter((d['lat'] for d in all_data), dtype=float, count=n),
+        'lon': np.fromiter((d['lon'] for d in all_data), dtype=float, count=n),
+        'temperature': np.fromiter((d['temperature'] for d in all_data), dtype=float, count=n),
+        'wind_speed': np.fromiter((d['wind_speed'] for d in all_data), dtype=float, count=n),
+        'precipitation': np.fromiter((d['precipitation'] for d in all_data), dtype=float, count=n),
+        'humidity': np.fromiter((d['humidity'] for d in all_data), dtype=float, count=n),
+    }
 
-def create_user_summary(result):
+
+def create_user_summary(result, arrays=None):
     """Create a user-friendly summary of the weather analysis"""
     stats = result['statistics']
     risks = result['risk_analysis']
+
+    if arrays is not None:
+        total_precipitation = arrays['precipitation'].sum()
+    else:
+        total_precipitation = sum(d['precipitation'] for d in result['all_data'])
     
     summary = {
         'overview': {
@@ -144,7 +216,7 @@ def create_user_summary(result):
             'temperature_range': f"{stats['temperature']['minimum']:.1f}°C - {stats['temperature']['maximum']:.1f}°C",
             'average_humidity': f"{stats['humidity']['average']:.1f}%",
             'average_wind_speed': f"{stats['wind_speed']['average']:.1f} m/s",
-            'total_precipitation': f"{sum([d['precipitation'] for d in result['all_data']]):.1f} mm"
+            'total_precipitation': f"{total_precipitation:.1f} mm"
         },
         'risk_assessment': {
             'very_hot_days': f"{risks['very_hot']['probability']:.1f}%",
@@ -166,13 +238,15 @@ def get_progress(task_id):
         return jsonify({'error': 'Task not found'}), 404
     
     tracker = active_tasks[task_id]
-    
+
+    # One reference read gives a self-consistent progress/total/status trio
+    snap = tracker.snapshot
     response = {
         'task_id': task_id,
-        'progress': tracker.progress,
-        'total': tracker.total,
-        'status': tracker.status,
-        'percentage': (tracker.progress / tracker.total * 100) if tracker.total > 0 else 0,
+        'progress': snap['progress'],
+        'total': snap['total'],
+        'status': snap['status'],
+        'percentage': (snap['progress'] / snap['total'] * 100) if snap['total'] > 0 else 0,
         'elapsed_time': int(time.time() - tracker.start_time)
     }
     
@@ -186,8 +260,11 @@ def get_progress(task_id):
     if tracker.error:
         response['error'] = tracker.error
         response['completed'] = False
-    
-    return jsonify(response)
+
+    resp = jsonify(response)
+    # Polled every second - never let an intermediary cache a stale state
+    resp.headers['Cache-Control'] = 'no-store'
+    return resp
 
 @weather_bp.route('/result/<task_id>', methods=['GET'])
 def get_result(task_id):
@@ -223,7 +300,7 @@ def export_data(task_id, format):
         if format.lower() == 'json':
             return export_json(tracker.result, task_id)
         elif format.lower() == 'csv':
-            return export_csv(tracker.result, task_id)
+            return export_csv(tracker.result, task_id, arrays=tracker.arrays)
         else:
             return jsonify({'error': 'Unsupported format use csv'}), 400
     except Exception as e:
@@ -233,7 +310,7 @@ def export_json(result, task_id):
     """Export data in JSON format"""
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     filename = f"atmora_weather_analysis_{task_id[:8]}_{timestamp}.json"
-    
+
     export_data = {
         'metadata': {
             'export_time': datetime.now().isoformat(),
@@ -249,32 +326,50 @@ def export_json(result, task_id):
         'risk_analysis': result.get('risk_analysis', {}),
         'daily_data': result.get('all_data', [])
     }
-    
-    temp_file = tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False)
-    try:
-        json.dump(export_data, temp_file, indent=2, ensure_ascii=False)
-        temp_file.close()
-        
-        return send_file(
-            temp_file.name,
-            as_attachment=True,
-            download_name=filename,
-            mimetype='application/json'
-        )
-    finally:
-        if os.path.exists(temp_file.name):
-            os.unlink(temp_file.name)
 
-def export_csv(result, task_id):
+    # Serialize straight to the response - no tempfile write/send/unlink
+    # round-trip through the disk
+    body = orjson.dumps(export_data, option=orjson.OPT_INDENT_2)
+    return Response(
+        body,
+        mimetype='application/json',
+        headers={'Content-Disposition': f'attachment; filename={filename}'}
+    )
+
+# Flush streamed CSV exports to the socket every this many rows
+_CSV_ROWS_PER_CHUNK = 2000
+
+def _csv_rows(result, arrays):
+    """Materialize the export rows, rounding numeric columns in bulk
+    when the tracker's column view is available"""
+    if arrays is not None:
+        rounded = (np.round(arrays[column], 2).tolist()
+                   for column in ('temperature', 'wind_speed',
+                                  'precipitation', 'humidity'))
+        return list(zip(arrays['date'], arrays['lat'].tolist(),
+                        arrays['lon'].tolist(), *rounded))
+
+    return [
+        (point['date'], point['lat'], point['lon'],
+         round(point['temperature'], 2), round(point['wind_speed'], 2),
+         round(point['precipitation'], 2), round(point['humidity'], 2))
+        for point in result.get('all_data', [])
+    ]
+
+
+def export_csv(result, task_id, arrays=None):
     """Export data in CSV format"""
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     filename = f"atmora_weather_data_{task_id[:8]}_{timestamp}.csv"
-    
-    temp_file = tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False, encoding='utf-8', newline='')
-    
-    try:
-        writer = csv.writer(temp_file)
-        
+
+    rows = _csv_rows(result, arrays)
+
+    def generate():
+        # Stream straight to the client: first byte goes out with the
+        # header instead of after a full tempfile write
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+
         writer.writerow([
             'Date',
             'Latitude',
@@ -284,30 +379,22 @@ def export_csv(result, task_id):
             'Precipitation (mm)',
             'Humidity (%)'
         ])
-        
-        all_data = result.get('all_data', [])
-        for point in all_data:
-            writer.writerow([
-                point['date'],
-                point['lat'],
-                point['lon'],
-                round(point['temperature'], 2),
-                round(point['wind_speed'], 2),
-                round(point['precipitation'], 2),
-                round(point['humidity'], 2)
-            ])
-        
-        temp_file.close()
-        
-        return send_file(
-            temp_file.name,
-            as_attachment=True,
-            download_name=filename,
-            mimetype='text/csv'
-        )
-    finally:
-        if os.path.exists(temp_file.name):
-            os.unlink(temp_file.name)
+
+        # writerows batches the per-row Python calls; flush in slices so
+        # huge exports still stream instead of buffering fully
+        for start in range(0, len(rows), _CSV_ROWS_PER_CHUNK):
+            writer.writerows(rows[start:start + _CSV_ROWS_PER_CHUNK])
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+
+        yield buffer.getvalue()
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/csv',
+        headers={'Content-Disposition': f'attachment; filename={filename}'}
+    )
 
 @weather_bp.route('/cleanup/<task_id>', methods=['DELETE'])
 def cleanup_task(task_id):
@@ -323,11 +410,12 @@ def list_tasks():
     """List all active tasks (for debugging)"""
     task_list = []
     for task_id, tracker in active_tasks.items():
+        snap = tracker.snapshot
         task_info = {
             'task_id': task_id,
-            'status': tracker.status,
-            'progress': tracker.progress,
-            'total': tracker.total,
+            'status': snap['status'],
+            'progress': snap['progress'],
+            'total': snap['total'],
             'elapsed_time': int(time.time() - tracker.start_time),
             'has_result': tracker.result is not None,
             'has_error': tracker.error is not None
@@ -3,6 +3,7 @@ Global Population Density Service
 Generates grid-based population density data for world visualization
 """
 
+import functools
 import numpy as np
 from datetime import datetime
 from typing import List, Dict, Tuple
@@ -10,108 +11,238 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Major cities with their populations (simplified dataset)
+# City, lat, lon, base_population (millions), growth_rate (% per year)
+_MAJOR_CITIES = [
+    ("Tokyo", 35.6762, 139.6503, 37.4, 0.3),
+    ("Delhi", 28.7041, 77.1025, 30.3, 2.1),
+    ("Shanghai", 31.2304, 121.4737, 27.1, 1.2),
+    ("São Paulo", -23.5505, -46.6333, 22.0, 0.8),
+    ("Mexico City", 19.4326, -99.1332, 21.8, 1.0),
+    ("Cairo", 30.0444, 31.2357, 20.9, 2.0),
+    ("Dhaka", 23.8103, 90.4125, 21.0, 3.5),
+    ("Mumbai", 19.0760, 72.8777, 20.4, 1.8),
+    ("Beijing", 39.9042, 116.4074, 20.4, 1.5),
+    ("Osaka", 34.6937, 135.5023, 19.3, 0.2),
+    ("New York", 40.7128, -74.0060, 18.8, 0.5),
+    ("Karachi", 24.8607, 67.0011, 16.0, 2.5),
+    ("Buenos Aires", -34.6037, -58.3816, 15.2, 0.9),
+    ("Chongqing", 29.4316, 106.9123, 15.3, 1.8),
+    ("Istanbul", 41.0082, 28.9784, 15.5, 1.7),
+    ("Kolkata", 22.5726, 88.3639, 14.9, 1.5),
+    ("Manila", 14.5995, 120.9842, 13.9, 2.0),
+    ("Lagos", 6.5244, 3.3792, 14.4, 3.5),
+    ("Rio de Janeiro", -22.9068, -43.1729, 13.5, 0.7),
+    ("Tianjin", 39.3434, 117.3616, 13.6, 1.3),
+    ("Kinshasa", -4.4419, 15.2663, 14.3, 4.0),
+    ("Guangzhou", 23.1291, 113.2644, 13.3, 1.5),
+    ("Los Angeles", 34.0522, -118.2437, 12.4, 0.6),
+    ("Moscow", 55.7558, 37.6173, 12.5, 0.3),
+    ("Shenzhen", 22.5431, 114.0579, 12.4, 2.5),
+    ("Lahore", 31.5204, 74.3587, 12.3, 2.8),
+    ("Bangalore", 12.9716, 77.5946, 11.9, 2.5),
+    ("Paris", 48.8566, 2.3522, 11.0, 0.4),
+    ("Bogotá", 4.7110, -74.0721, 10.8, 1.3),
+    ("Jakarta", -6.2088, 106.8456, 10.6, 1.4),
+    ("Chennai", 13.0827, 80.2707, 10.5, 1.8),
+    ("Lima", -12.0464, -77.0428, 10.6, 1.5),
+    ("Bangkok", 13.7563, 100.5018, 10.5, 1.2),
+    ("Seoul", 37.5665, 126.9780, 9.8, 0.4),
+    ("Nagoya", 35.1815, 136.9066, 9.5, 0.1),
+    ("Hyderabad", 17.3850, 78.4867, 9.7, 2.3),
+    ("London", 51.5074, -0.1278, 9.3, 0.8),
+    ("Tehran", 35.6892, 51.3890, 9.1, 1.0),
+    ("Chicago", 41.8781, -87.6298, 8.9, 0.3),
+    ("Chengdu", 30.5728, 104.0668, 9.0, 1.7),
+    ("Nanjing", 32.0603, 118.7969, 8.7, 1.3),
+    ("Wuhan", 30.5928, 114.3055, 8.4, 1.5),
+    ("Ho Chi Minh", 10.8231, 106.6297, 8.6, 2.0),
+    ("Luanda", -8.8383, 13.2344, 8.3, 3.8),
+    ("Ahmedabad", 23.0225, 72.5714, 8.0, 2.4),
+    ("Kuala Lumpur", 3.1390, 101.6869, 7.9, 2.2),
+    ("Hong Kong", 22.3193, 114.1694, 7.5, 0.5),
+    ("Dongguan", 23.0209, 113.7518, 8.3, 1.8),
+    ("Foshan", 23.0218, 113.1219, 7.7, 1.6),
+    ("Hangzhou", 30.2741, 120.1551, 7.6, 1.8),
+    ("Shenyang", 41.8057, 123.4328, 7.5, 0.9),
+    ("Riyadh", 24.7136, 46.6753, 7.2, 2.5),
+    ("Baghdad", 33.3152, 44.3661, 7.2, 2.3),
+    ("Santiago", -33.4489, -70.6693, 6.8, 1.0),
+    ("Surat", 21.1702, 72.8311, 6.5, 3.0),
+    ("Madrid", 40.4168, -3.7038, 6.6, 0.7),
+    ("Suzhou", 31.2989, 120.5853, 6.7, 1.5),
+    ("Pune", 18.5204, 73.8567, 6.5, 2.8),
+    ("Harbin", 45.8038, 126.5340, 6.3, 0.5),
+    ("Houston", 29.7604, -95.3698, 6.3, 1.8),
+    ("Dallas", 32.7767, -96.7970, 6.3, 1.9),
+    ("Toronto", 43.6532, -79.3832, 6.2, 1.5),
+    ("Dar es Salaam", -6.7924, 39.2083, 6.4, 5.0),
+    ("Miami", 25.7617, -80.1918, 6.1, 1.2),
+    ("Belo Horizonte", -19.9167, -43.9345, 6.0, 0.8),
+    ("Singapore", 1.3521, 103.8198, 5.9, 1.2),
+    ("Philadelphia", 39.9526, -75.1652, 5.7, 0.4),
+    ("Atlanta", 33.7490, -84.3880, 5.8, 1.6),
+    ("Fukuoka", 33.5904, 130.4017, 5.6, 0.3),
+    ("Khartoum", 15.5007, 32.5599, 5.5, 2.8),
+    ("Barcelona", 41.3874, 2.1686, 5.6, 0.6),
+    ("Johannesburg", -26.2041, 28.0473, 5.6, 1.8),
+    ("Saint Petersburg", 59.9343, 30.3351, 5.4, 0.2),
+    ("Qingdao", 36.0671, 120.3826, 5.4, 1.4),
+    ("Dalian", 38.9140, 121.6147, 5.3, 0.8),
+    ("Washington DC", 38.9072, -77.0369, 5.2, 1.0),
+    ("Yangon", 16.8661, 96.1951, 5.3, 1.8),
+    ("Alexandria", 31.2001, 29.9187, 5.2, 1.5),
+    ("Jinan", 36.6512, 117.1200, 5.1, 1.2),
+    ("Guadalajara", 20.6597, -103.3496, 5.0, 1.5),
+]
+
+# Structure-of-arrays view of the city table so the density grid can be
+# computed with whole-array NumPy expressions instead of per-city loops
+_CITY_LAT = np.array([c[1] for c in _MAJOR_CITIES])
+_CITY_LON = np.array([c[2] for c in _MAJOR_CITIES])
+_CITY_BASE_POP = np.array([c[3] for c in _MAJOR_CITIES])
+_CITY_GROWTH = np.array([c[4] for c in _MAJOR_CITIES])
+
+# Halo ring offsets shared by every city: rings at 0.5/1.0/1.5 degrees
+# with 8/16/24 points, precomputed once at import
+_HALO_FACTORS = np.repeat([1, 2, 3], [8, 16, 24])
+_HALO_ANGLES = np.concatenate(
+    [2 * np.pi * np.arange(8 * r) / (8 * r) for r in (1, 2, 3)])
+_HALO_DLAT = _HALO_FACTORS * 0.5 * np.sin(_HALO_ANGLES)
+_HALO_DLON = _HALO_FACTORS * 0.5 * np.cos(_HALO_ANGLES)
+_HALO_DIVISOR = _HALO_FACTORS + 1.0
+
+# Region bounding boxes in get_region's order (first match wins); the
+# trailing Oceania entry is np.select's default
+_REGION_NAMES = ("East Asia", "South Asia", "Southeast Asia", "Middle East",
+                 "Europe", "North America", "South America", "Africa",
+                 "Oceania")
+_REGION_BOUNDS = (
+    # (lat_min, lat_max, lon_min, lon_max)
+    (20, 50, 100, 150),     # East Asia
+    (5, 35, 60, 100),       # South Asia
+    (-10, 25, 95, 140),     # Southeast Asia
+    (15, 40, 25, 60),       # Middle East
+    (35, 70, -10, 40),      # Europe
+    (25, 70, -170, -50),    # North America
+    (-55, 15, -85, -35),    # South America
+    (-35, 37, -20, 55),     # Africa
+)
+
+
+# Regional population density factors (people per km²)
+_REGIONAL_DENSITY = {
+    "East Asia": 150,
+    "South Asia": 400,
+    "Southeast Asia": 150,
+    "Middle East": 50,
+    "Europe": 100,
+    "North America": 20,
+    "South America": 25,
+    "Africa": 45,
+    "Oceania": 5
+}
+
+# float32 is exact for these whole-number densities and halves the
+# gather footprint when the LUT is fancy-indexed per grid cell
+_DENSITY_LUT = np.array([_REGIONAL_DENSITY[name] for name in _REGION_NAMES],
+                        dtype=np.float32)
+
+
+def _build_region_table() -> np.ndarray:
+    """Precompute a (180, 360) region-code table at 1-degree bins.
+
+    Filled in reverse priority order so earlier rules overwrite later
+    ones, matching get_region's first-match-wins chain. Classification
+    becomes one fancy-indexed load instead of eight boolean masks per
+    grid build. Strict bounds are honoured at the integer corners the
+    density grid samples: a rectangle owns bins (lat_min, lat_max) x
+    (lon_min, lon_max) exclusive, exactly like the scalar comparisons.
+    """
+    table = np.full((180, 360), len(_REGION_BOUNDS), dtype=np.uint8)
+    for code in reversed(range(len(_REGION_BOUNDS))):
+        lat_min, lat_max, lon_min, lon_max = _REGION_BOUNDS[code]
+        table[lat_min + 91:lat_max + 90, lon_min + 181:lon_max + 180] = code
+    return table
+
+
+_REGION_TABLE = _build_region_table()
+
+_TYPE_LABELS = ("city_core", "city_suburb", "regional")
+_BASE_YEAR = 2024
+
+
+@functools.lru_cache(maxsize=32)
+def _build_grid(target_year: int, grid_resolution: float) -> Tuple[np.ndarray, ...]:
+    """
+    Build the density grid for one (year, resolution) pair as flat arrays
+    (lat, lon, intensity, population, type_code).
+
+    Deterministic: the random regional variation is drawn from a generator
+    seeded with the year, so repeat requests hit the lru_cache and equal
+    years always render the same map.
+    """
+    logger.info(f"🌍 Generating global population density for year {target_year}")
+
+    # City populations for the target year, one vectorized growth step
+    city_pops = _CITY_BASE_POP * (1 + _CITY_GROWTH / 100.0) ** (target_year - _BASE_YEAR)
+
+    # City cores - highest density, normalized to 0-1
+    core_intensity = np.minimum(1.0, city_pops / 40.0)
+    core_pop = city_pops * 1_000_000
+
+    # Surrounding halo rings with decreasing intensity: broadcast the
+    # precomputed ring offsets across all cities at once instead of
+    # computing sin/cos per point in Python
+    suburb_lat = (_CITY_LAT[:, None] + _HALO_DLAT[None, :]).ravel()
+    suburb_lon = (_CITY_LON[:, None] + _HALO_DLON[None, :]).ravel()
+    suburb_intensity = np.minimum(
+        1.0, (city_pops[:, None] / 40.0) / _HALO_DIVISOR[None, :]).ravel()
+    suburb_pop = (city_pops[:, None] * 1_000_000 / _HALO_DIVISOR[None, :]).ravel()
+
+    # Regional background density, classified and drawn for the whole
+    # grid at once rather than ~12k scalar get_region calls
+    grid_lat, grid_lon = np.meshgrid(
+        np.arange(-60, 70, grid_resolution * 2),
+        np.arange(-180, 180, grid_resolution * 2),
+        indexing='ij')
+
+    lat_idx = np.clip(np.floor(grid_lat).astype(np.intp) + 90, 0, 179)
+    lon_idx = np.clip(np.floor(grid_lon).astype(np.intp) + 180, 0, 359)
+    base_density = _DENSITY_LUT[_REGION_TABLE[lat_idx, lon_idx]]
+
+    # Vary density with one seeded draw for the whole grid
+    rng = np.random.default_rng(seed=target_year)
+    adjusted_density = base_density * rng.uniform(0.7, 1.3, grid_lat.shape)
+
+    # Normalize to 0-1 against ~400 people/km², kept lower than cities
+    intensity = np.minimum(1.0, adjusted_density / 400.0) * 0.3
+
+    visible = intensity > 0.05  # Only add visible points
+
+    lat = np.concatenate([_CITY_LAT, suburb_lat, grid_lat[visible]])
+    lon = np.concatenate([_CITY_LON, suburb_lon, grid_lon[visible]])
+    intensity = np.concatenate([core_intensity, suburb_intensity,
+                                intensity[visible]])
+    population = np.concatenate([core_pop, suburb_pop,
+                                 adjusted_density[visible] * 10000])
+    type_code = np.repeat(
+        np.arange(3), [len(_CITY_LAT), len(suburb_lat), int(visible.sum())])
+
+    for array in (lat, lon, intensity, population, type_code):
+        array.flags.writeable = False
+
+    logger.info(f"✅ Generated {len(lat)} density points")
+
+    return lat, lon, intensity, population, type_code
+
 
 class GlobalPopulationDensityService:
     """Service for generating global population density heat maps"""
-    
+
     def __init__(self):
-        # Major cities with their populations (simplified dataset)
-        self.major_cities = [
-            # City, lat, lon, base_population (millions), growth_rate (% per year)
-            ("Tokyo", 35.6762, 139.6503, 37.4, 0.3),
-            ("Delhi", 28.7041, 77.1025, 30.3, 2.1),
-            ("Shanghai", 31.2304, 121.4737, 27.1, 1.2),
-            ("São Paulo", -23.5505, -46.6333, 22.0, 0.8),
-            ("Mexico City", 19.4326, -99.1332, 21.8, 1.0),
-            ("Cairo", 30.0444, 31.2357, 20.9, 2.0),
-            ("Dhaka", 23.8103, 90.4125, 21.0, 3.5),
-            ("Mumbai", 19.0760, 72.8777, 20.4, 1.8),
-            ("Beijing", 39.9042, 116.4074, 20.4, 1.5),
-            ("Osaka", 34.6937, 135.5023, 19.3, 0.2),
-            ("New York", 40.7128, -74.0060, 18.8, 0.5),
-            ("Karachi", 24.8607, 67.0011, 16.0, 2.5),
-            ("Buenos Aires", -34.6037, -58.3816, 15.2, 0.9),
-            ("Chongqing", 29.4316, 106.9123, 15.3, 1.8),
-            ("Istanbul", 41.0082, 28.9784, 15.5, 1.7),
-            ("Kolkata", 22.5726, 88.3639, 14.9, 1.5),
-            ("Manila", 14.5995, 120.9842, 13.9, 2.0),
-            ("Lagos", 6.5244, 3.3792, 14.4, 3.5),
-            ("Rio de Janeiro", -22.9068, -43.1729, 13.5, 0.7),
-            ("Tianjin", 39.3434, 117.3616, 13.6, 1.3),
-            ("Kinshasa", -4.4419, 15.2663, 14.3, 4.0),
-            ("Guangzhou", 23.1291, 113.2644, 13.3, 1.5),
-            ("Los Angeles", 34.0522, -118.2437, 12.4, 0.6),
-            ("Moscow", 55.7558, 37.6173, 12.5, 0.3),
-            ("Shenzhen", 22.5431, 114.0579, 12.4, 2.5),
-            ("Lahore", 31.5204, 74.3587, 12.3, 2.8),
-            ("Bangalore", 12.9716, 77.5946, 11.9, 2.5),
-            ("Paris", 48.8566, 2.3522, 11.0, 0.4),
-            ("Bogotá", 4.7110, -74.0721, 10.8, 1.3),
-            ("Jakarta", -6.2088, 106.8456, 10.6, 1.4),
-            ("Chennai", 13.0827, 80.2707, 10.5, 1.8),
-            ("Lima", -12.0464, -77.0428, 10.6, 1.5),
-            ("Bangkok", 13.7563, 100.5018, 10.5, 1.2),
-            ("Seoul", 37.5665, 126.9780, 9.8, 0.4),
-            ("Nagoya", 35.1815, 136.9066, 9.5, 0.1),
-            ("Hyderabad", 17.3850, 78.4867, 9.7, 2.3),
-            ("London", 51.5074, -0.1278, 9.3, 0.8),
-            ("Tehran", 35.6892, 51.3890, 9.1, 1.0),
-            ("Chicago", 41.8781, -87.6298, 8.9, 0.3),
-            ("Chengdu", 30.5728, 104.0668, 9.0, 1.7),
-            ("Nanjing", 32.0603, 118.7969, 8.7, 1.3),
-            ("Wuhan", 30.5928, 114.3055, 8.4, 1.5),
-            ("Ho Chi Minh", 10.8231, 106.6297, 8.6, 2.0),
-            ("Luanda", -8.8383, 13.2344, 8.3, 3.8),
-            ("Ahmedabad", 23.0225, 72.5714, 8.0, 2.4),
-            ("Kuala Lumpur", 3.1390, 101.6869, 7.9, 2.2),
-            ("Hong Kong", 22.3193, 114.1694, 7.5, 0.5),
-            ("Dongguan", 23.0209, 113.7518, 8.3, 1.8),
-            ("Foshan", 23.0218, 113.1219, 7.7, 1.6),
-            ("Hangzhou", 30.2741, 120.1551, 7.6, 1.8),
-            ("Shenyang", 41.8057, 123.4328, 7.5, 0.9),
-            ("Riyadh", 24.7136, 46.6753, 7.2, 2.5),
-            ("Baghdad", 33.3152, 44.3661, 7.2, 2.3),
-            ("Santiago", -33.4489, -70.6693, 6.8, 1.0),
-            ("Surat", 21.1702, 72.8311, 6.5, 3.0),
-            ("Madrid", 40.4168, -3.7038, 6.6, 0.7),
-            ("Suzhou", 31.2989, 120.5853, 6.7, 1.5),
-            ("Pune", 18.5204, 73.8567, 6.5, 2.8),
-            ("Harbin", 45.8038, 126.5340, 6.3, 0.5),
-            ("Houston", 29.7604, -95.3698, 6.3, 1.8),
-            ("Dallas", 32.7767, -96.7970, 6.3, 1.9),
-            ("Toronto", 43.6532, -79.3832, 6.2, 1.5),
-            ("Dar es Salaam", -6.7924, 39.2083, 6.4, 5.0),
-            ("Miami", 25.7617, -80.1918, 6.1, 1.2),
-            ("Belo Horizonte", -19.9167, -43.9345, 6.0, 0.8),
-            ("Singapore", 1.3521, 103.8198, 5.9, 1.2),
-            ("Philadelphia", 39.9526, -75.1652, 5.7, 0.4),
-            ("Atlanta", 33.7490, -84.3880, 5.8, 1.6),
-            ("Fukuoka", 33.5904, 130.4017, 5.6, 0.3),
-            ("Khartoum", 15.5007, 32.5599, 5.5, 2.8),
-            ("Barcelona", 41.3874, 2.1686, 5.6, 0.6),
-            ("Johannesburg", -26.2041, 28.0473, 5.6, 1.8),
-            ("Saint Petersburg", 59.9343, 30.3351, 5.4, 0.2),
-            ("Qingdao", 36.0671, 120.3826, 5.4, 1.4),
-            ("Dalian", 38.9140, 121.6147, 5.3, 0.8),
-            ("Washington DC", 38.9072, -77.0369, 5.2, 1.0),
-            ("Yangon", 16.8661, 96.1951, 5.3, 1.8),
-            ("Alexandria", 31.2001, 29.9187, 5.2, 1.5),
-            ("Jinan", 36.6512, 117.1200, 5.1, 1.2),
-            ("Guadalajara", 20.6597, -103.3496, 5.0, 1.5),
-        ]
-        
-        # Regional population density factors (people per km²)
-        self.regional_density = {
-            "East Asia": 150,
-            "South Asia": 400,
-            "Southeast Asia": 150,
-            "Middle East": 50,
-            "Europe": 100,
-            "North America": 20,
-            "South America": 25,
-            "Africa": 45,
-            "Oceania": 5
-        }
+        self.major_cities = _MAJOR_CITIES
+        self.regional_density = _REGIONAL_DENSITY
     
     def calculate_population_for_year(self, base_pop: float, growth_rate: float, 
                                      base_year: int, target_year: int) -> float:
@@ -152,93 +283,76 @@ class GlobalPopulationDensityService:
         Returns:
             List of density points with [lat, lon, intensity]
         """
-        target_year = target_date.year
-        base_year = 2024
-        
-        logger.info(f"🌍 Generating global population density for year {target_year}")
-        
-        density_points = []
-        
-        # Generate city-based density points
-        for city_name, lat, lon, base_pop, growth_rate in self.major_cities:
-            # Calculate population for target year
-            city_pop = self.calculate_population_for_year(
-                base_pop, growth_rate, base_year, target_year
-            )
-            
-            # City core - highest density
-            density_points.append({
-                "lat": lat,
-                "lon": lon,
-                "intensity": min(1.0, city_pop / 40.0),  # Normalized to 0-1
-                "population": city_pop * 1_000_000,
-                "type": "city_core"
-            })
-            
-            # Add surrounding area points with decreasing intensity
-            for radius_factor in [1, 2, 3]:
-                radius_deg = radius_factor * 0.5  # degrees
-                num_points = 8 * radius_factor
-                
-                for i in range(num_points):
-                    angle = (2 * np.pi * i) / num_points
-                    point_lat = lat + radius_deg * np.sin(angle)
-                    point_lon = lon + radius_deg * np.cos(angle)
-                    
-                    # Decrease intensity with distance
-                    intensity = (city_pop / 40.0) * (1.0 / (radius_factor + 1))
-                    
-                    density_points.append({
-                        "lat": point_lat,
-                        "lon": point_lon,
-                        "intensity": min(1.0, intensity),
-                        "population": city_pop * 1_000_000 / (radius_factor + 1),
-                        "type": "city_suburb"
-                    })
-        
-        # Add regional background density
-        for lat in np.arange(-60, 70, grid_resolution * 2):
-            for lon in np.arange(-180, 180, grid_resolution * 2):
-                region = self.get_region(lat, lon)
-                base_density = self.regional_density[region]
-                
-                # Vary density with random factor
-                density_variation = np.random.uniform(0.7, 1.3)
-                adjusted_density = base_density * density_variation
-                
-                # Calculate intensity (normalize to 0-1 range)
-                # Max density ~400 people/km²
-                intensity = min(1.0, adjusted_density / 400.0) * 0.3  # Keep regional lower than cities
-                
-                if intensity > 0.05:  # Only add visible points
-                    density_points.append({
-                        "lat": lat,
-                        "lon": lon,
-                        "intensity": intensity,
-                        "population": adjusted_density * 10000,  # Approximate
-                        "type": "regional"
-                    })
-        
-        logger.info(f"✅ Generated {len(density_points)} density points")
-        
-        return density_points
+        # Heavy lifting is cached per (year, resolution); only the response
+        # dicts are materialized per call
+        lat, lon, intensity, population, type_code = _build_grid(
+            target_date.year, float(grid_resolution))
+
+        return [
+            {
+                "lat": p_lat,
+                "lon": p_lon,
+                "intensity": p_intensity,
+                "population": p_population,
+                "type": _TYPE_LABELS[p_type]
+            }
+            for p_lat, p_lon, p_intensity, p_population, p_type in zip(
+                lat, lon, intensity, population, type_code)
+        ]
     
-    def get_density_statistics(self, density_points: List[Dict]) -> Dict:
-        """Calculate statistics for density data"""
-        total_population = sum(p["population"] for p in density_points)
-        avg_intensity = np.mean([p["intensity"] for p in density_points])
-        max_intensity = max(p["intensity"] for p in density_points)
-        
-        # Count by type
-        city_cores = len([p for p in density_points if p["type"] == "city_core"])
-        city_suburbs = len([p for p in density_points if p["type"] == "city_suburb"])
-        regional = len([p for p in density_points if p["type"] == "regional"])
-        
+    def get_density_arrays(self, target_date: datetime,
+                           grid_resolution: float = 2.0) -> Dict[str, np.ndarray]:
+        """
+        Column-oriented variant of generate_global_density_grid: the same
+        cached grid as read-only arrays, with no per-point dict churn.
+        Preferred for array-aware consumers (statistics, serialization).
+        """
+        lat, lon, intensity, population, type_code = _build_grid(
+            target_date.year, float(grid_resolution))
+        return {
+            "lat": lat,
+            "lon": lon,
+            "intensity": intensity,
+            "population": population,
+            "type": type_code,
+        }
+
+    def get_density_statistics(self, density_points) -> Dict:
+        """Calculate statistics for density data (accepts the list-of-dicts
+        grid or the column view from get_density_arrays)"""
+        if isinstance(density_points, dict):
+            intensity = density_points["intensity"]
+            counts = np.bincount(density_points["type"], minlength=3)
+            total_points = len(intensity)
+            total_population = density_points["population"].sum()
+            avg_intensity = intensity.mean()
+            max_intensity = intensity.max()
+            city_cores, city_suburbs, regional = (int(c) for c in counts)
+        else:
+            # Single pass with local accumulators instead of five separate
+            # traversals (sum, mean, max and three filtered counts)
+            total_points = len(density_points)
+            total_population = 0.0
+            intensity_sum = 0.0
+            max_intensity = 0.0
+            type_counts = {"city_core": 0, "city_suburb": 0, "regional": 0}
+            for p in density_points:
+                total_population += p["population"]
+                intensity = p["intensity"]
+                intensity_sum += intensity
+                if intensity > max_intensity:
+                    max_intensity = intensity
+                type_counts[p["type"]] += 1
+            avg_intensity = intensity_sum / total_points if total_points else 0.0
+            city_cores = type_counts["city_core"]
+            city_suburbs = type_counts["city_suburb"]
+            regional = type_counts["regional"]
+
         return {
-            "total_points": len(density_points),
+            "total_points": total_points,
             "estimated_global_population": int(total_population),
-            "average_intensity": round(avg_intensity, 3),
-            "max_intensity": round(max_intensity, 3),
+            "average_intensity": round(float(avg_intensity), 3),
+            "max_intensity": round(float(max_intensity), 3),
             "breakdown": {
                 "city_cores": city_cores,
                 "city_suburbs": city_suburbs,
@@ -3,18 +3,146 @@ NASA Harmony API Population Service
 Handles population data retrieval for geographic areas
 """
 
+import functools
+import hashlib
+import math
+import orjson
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 import time
 import numpy as np
+from scipy.spatial import cKDTree
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Major urban centers used by the simulated estimate:
+# (city, lat, lon, density multiplier)
+_URBAN_CENTERS = [
+    ("Istanbul", 41.0082, 28.9784, 20),
+    ("New York", 40.7128, -74.0060, 25),
+    ("London", 51.5074, -0.1278, 22),
+    ("Tokyo", 35.6762, 139.6503, 30),
+    ("Paris", 48.8566, 2.3522, 20),
+    ("Berlin", 52.5200, 13.4050, 18),
+    ("Moscow", 55.7558, 37.6173, 20),
+    ("Beijing", 39.9042, 116.4074, 25),
+    ("Sydney", -33.8688, 151.2093, 15),
+    ("Cairo", 30.0444, 31.2357, 22),
+    ("Mumbai", 19.0760, 72.8777, 35),
+    ("Los Angeles", 34.0522, -118.2437, 20),
+    ("Singapore", 1.3521, 103.8198, 28),
+    ("Hong Kong", 22.3193, 114.1694, 32),
+    ("Seoul", 37.5665, 126.9780, 26),
+    ("Mexico City", 19.4326, -99.1332, 24),
+    ("São Paulo", -23.5505, -46.6333, 23),
+    ("Lagos", 6.5244, 3.3792, 27),
+    ("Dhaka", 23.8103, 90.4125, 38),
+    ("Karachi", 24.8607, 67.0011, 30),
+]
 
-@dataclass
+# Parallel arrays so the proximity check is one vectorized pass instead
+# of a Python loop over the table. float32 halves the bytes touched per
+# lookup — plenty of precision for city coordinates — and the arrays are
+# frozen since they are shared module state
+_URBAN_NAMES = tuple(c[0] for c in _URBAN_CENTERS)
+_URBAN_LAT = np.array([c[1] for c in _URBAN_CENTERS], dtype=np.float32)
+_URBAN_LON = np.array([c[2] for c in _URBAN_CENTERS], dtype=np.float32)
+_URBAN_MULT = np.array([c[3] for c in _URBAN_CENTERS], dtype=np.float32)
+for _arr in (_URBAN_LAT, _URBAN_LON, _URBAN_MULT):
+    _arr.flags.writeable = False
+del _arr
+
+# Climate-zone density multipliers by |latitude| band: tropical,
+# temperate, cool temperate, polar
+_CLIMATE_BANDS = np.array([23.5, 45.0, 66.5])
+_CLIMATE_MULTS = np.array([2.0, 2.5, 1.5, 0.05])
+
+_EARTH_RADIUS_KM = 6371.0
+# Urban influence radius; was "2 degrees" which over-reached toward the
+# poles where longitude degrees shrink
+_URBAN_RADIUS_KM = 200.0
+
+
+def _unit_vectors(lat_deg, lon_deg) -> np.ndarray:
+    """Map degree coordinates onto unit-sphere xyz (scalar or array)."""
+    lat = np.radians(lat_deg)
+    lon = np.radians(lon_deg)
+    cos_lat = np.cos(lat)
+    return np.stack([cos_lat * np.cos(lon), cos_lat * np.sin(lon),
+                     np.sin(lat)], axis=-1)
+
+
+# Spatial index built once at import: nearest-center queries stay O(log N)
+# as the table grows, and misses prune early via the upper bound. Indexing
+# unit-sphere xyz instead of raw degrees keeps the metric correct near the
+# poles and across the 180th meridian; tree distances are chord lengths.
+_URBAN_TREE = cKDTree(_unit_vectors(_URBAN_LAT, _URBAN_LON))
+_URBAN_CHORD_BOUND = 2.0 * math.sin(_URBAN_RADIUS_KM / (2.0 * _EARTH_RADIUS_KM))
+
+
+@functools.lru_cache(maxsize=4096)
+def _simulated_population(lat_q: int, lon_q: int, area_q: int) -> tuple:
+    """Core simulated-population math on quantized inputs.
+
+    Deterministic in (lat, lon, area), so map UIs that repeatedly query
+    overlapping spots hit the cache. Keys are milli-degrees and
+    centi-km² to keep near-identical queries on one entry.
+    """
+    avg_lat = lat_q / 1000.0
+    avg_lon = lon_q / 1000.0
+    area_km2 = area_q / 100.0
+
+    # Base population density (people per km²)
+    population_density = 50
+
+    # Adjust based on latitude (climate zones); searchsorted picks the
+    # band, matching the old strict < comparisons with side='right'
+    population_density *= _CLIMATE_MULTS[
+        np.searchsorted(_CLIMATE_BANDS, abs(avg_lat), side='right')]
+
+    # Nearest urban center via the import-time KD-tree; a miss comes
+    # back as idx == n with infinite distance
+    chord, idx = _URBAN_TREE.query(_unit_vectors(avg_lat, avg_lon), k=1,
+                                   distance_upper_bound=_URBAN_CHORD_BOUND)
+    if idx < len(_URBAN_NAMES):
+        # Great-circle distance back from the chord length
+        distance_km = 2.0 * _EARTH_RADIUS_KM * math.asin(chord / 2.0)
+        # 1.0 at center, 0.0 at the influence edge
+        proximity_factor = (_URBAN_RADIUS_KM - distance_km) / _URBAN_RADIUS_KM
+        population_density *= (1 + _URBAN_MULT[idx] * proximity_factor)
+        logger.info(f"🏙️ Near {_URBAN_NAMES[idx]}, applying urban multiplier")
+
+    # Coastal areas (simplified - more populated)
+    # This is a very rough approximation
+    if abs(avg_lon) < 20 or abs(avg_lon) > 160:  # Near major coastlines
+        population_density *= 1.3
+
+    # Calculate total population
+    estimated_population = int(area_km2 * population_density)
+
+    # Add some deterministic variation for realism. A coordinate hash
+    # keeps this pure: no process-wide random.seed, which would race
+    # under the threaded batch path
+    digest = hashlib.blake2b(f"{avg_lat:.4f},{avg_lon:.4f}".encode(),
+                             digest_size=4).digest()
+    variation = 0.8 + 0.4 * (int.from_bytes(digest, 'big') / 2 ** 32)
+    estimated_population = int(estimated_population * variation)
+
+    # Ensure minimum population
+    estimated_population = max(estimated_population, int(area_km2 * 5))
+
+    density = estimated_population / area_km2 if area_km2 > 0 else 0
+
+    return estimated_population, density
+
+
+@dataclass(slots=True, frozen=True)
 class BoundingBox:
     """Represents a geographical bounding box"""
     west: float
@@ -23,7 +151,41 @@ class BoundingBox:
     north: float
 
 
-@dataclass
+@functools.lru_cache(maxsize=4096)
+def _circle_bbox(lat: float, lon: float, radius_km: float) -> BoundingBox:
+    """Pure circle-to-bbox math, memoized on rounded inputs since map UIs
+    re-request the same geometries on every redraw."""
+    # Approximate conversion: 1 degree ≈ 111 km; longitude degrees
+    # shrink with cos(latitude), clamped away from zero at the poles
+    lat_offset = radius_km / 111.0
+    lon_offset = radius_km / (111.0 * max(math.cos(math.radians(lat)), 0.01))
+
+    return BoundingBox(
+        west=lon - lon_offset,
+        south=lat - lat_offset,
+        east=lon + lon_offset,
+        north=lat + lat_offset
+    )
+
+
+@functools.lru_cache(maxsize=4096)
+def _bbox_area_km2(west: float, south: float, east: float, north: float) -> float:
+    """Approximate bbox area in km², memoized like _circle_bbox."""
+    lat_diff = abs(north - south)
+    lon_diff = abs(east - west)
+
+    # Convert to km (1 degree ≈ 111 km for latitude)
+    height_km = lat_diff * 111.0
+    # Kilometres per degree of longitude shrink with cos(latitude);
+    # the old clamped avg_lat/90 ratio had it backwards and collapsed
+    # equatorial boxes to near-zero area
+    avg_lat = (north + south) / 2
+    width_km = lon_diff * 111.320 * math.cos(math.radians(avg_lat))
+
+    return height_km * width_km
+
+
+@dataclass(slots=True, frozen=True)
 class PopulationData:
     """Represents population data for a region"""
     total_population: int
@@ -33,14 +195,28 @@ class PopulationData:
     geometry_type: str
     data_source: str
     timestamp: str
-    
+
     def to_dict(self):
-        return asdict(self)
+        # Flat literal instead of asdict(), which walks the instance
+        # recursively and deep-copies every field
+        return {
+            'total_population': self.total_population,
+            'area_km2': self.area_km2,
+            'density': self.density,
+            'coordinates': self.coordinates,
+            'geometry_type': self.geometry_type,
+            'data_source': self.data_source,
+            'timestamp': self.timestamp,
+        }
 
 
 class HarmonyAPIClient:
     """Client for NASA Harmony API"""
     
+    # Collections listings change rarely; reuse them for an hour instead
+    # of paying a Harmony round-trip per analyzed geometry
+    COLLECTIONS_CACHE_TTL = 3600
+
     def __init__(self, base_url: str = "https://harmony.earthdata.nasa.gov"):
         self.base_url = base_url
         self.session = requests.Session()
@@ -48,6 +224,17 @@ class HarmonyAPIClient:
             'User-Agent': 'AtmoraPopulationAnalyzer/1.0',
             'Accept': 'application/json'
         })
+        # Keep TLS connections alive across calls and retry transient
+        # gateway errors with backoff instead of failing the analysis
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=32,
+            max_retries=Retry(total=3, backoff_factor=0.5,
+                              status_forcelist=[502, 503, 504])
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self._collections_cache = None  # (timestamp, collections)
     
     def calculate_bounding_box_from_circle(self, lat: float, lon: float, radius_km: float) -> BoundingBox:
         """
@@ -61,16 +248,28 @@ class HarmonyAPIClient:
         Returns:
             BoundingBox object with calculated bounds
         """
-        # Approximate conversion: 1 degree ≈ 111 km
-        lat_offset = radius_km / 111.0
-        lon_offset = radius_km / (111.0 * abs(lat) if lat != 0 else 111.0)
-        
-        return BoundingBox(
-            west=lon - lon_offset,
-            south=lat - lat_offset,
-            east=lon + lon_offset,
-            north=lat + lat_offset
-        )
+        # Rounding the key tolerates float jitter between repeated UI
+        # queries; BoundingBox is frozen so sharing the cached instance
+        # is safe
+        return _circle_bbox(round(lat, 6), round(lon, 6), round(radius_km, 6))
+
+    def calculate_bboxes_from_circles(self, lats, lons, radii) -> np.ndarray:
+        """
+        Vectorized circle-to-bbox conversion for batch callers.
+
+        Takes parallel arrays of centers and radii (km) and returns an
+        (N, 4) contiguous float32 array of [west, south, east, north]
+        rows, using the same cosine-scaled offsets as the scalar version.
+        """
+        lats = np.asarray(lats, dtype=np.float32)
+        lons = np.asarray(lons, dtype=np.float32)
+        radii = np.asarray(radii, dtype=np.float32)
+
+        lat_off = radii / 111.0
+        lon_off = radii / (111.0 * np.maximum(np.cos(np.radians(lats)), 0.01))
+        return np.ascontiguousarray(
+            np.stack([lons - lon_off, lats - lat_off,
+                      lons + lon_off, lats + lat_off], axis=1))
     
     def calculate_bounding_box_from_rectangle(self, bounds: List[List[float]]) -> BoundingBox:
         """
@@ -102,17 +301,20 @@ class HarmonyAPIClient:
         Returns:
             Area in square kilometers
         """
-        # Approximate calculation
-        lat_diff = abs(bbox.north - bbox.south)
-        lon_diff = abs(bbox.east - bbox.west)
-        
-        # Convert to km (1 degree ≈ 111 km for latitude)
-        height_km = lat_diff * 111.0
-        # Longitude varies with latitude
-        avg_lat = (bbox.north + bbox.south) / 2
-        width_km = lon_diff * 111.0 * abs(max(-1, min(1, avg_lat / 90)))
-        
-        return height_km * width_km
+        return _bbox_area_km2(round(bbox.west, 6), round(bbox.south, 6),
+                              round(bbox.east, 6), round(bbox.north, 6))
+
+    def calculate_area_km2_batch(self, bboxes: np.ndarray) -> np.ndarray:
+        """
+        Vectorized area for an (N, 4) array of [west, south, east, north]
+        rows, using the same cosine-scaled approximation as the scalar
+        version.
+        """
+        bboxes = np.asarray(bboxes, dtype=float)
+        lat_diff = np.abs(bboxes[:, 3] - bboxes[:, 1])
+        lon_diff = np.abs(bboxes[:, 2] - bboxes[:, 0])
+        avg_lat = (bboxes[:, 3] + bboxes[:, 1]) / 2
+        return lat_diff * 111.0 * lon_diff * 111.320 * np.cos(np.radians(avg_lat))
     
     def get_available_collections(self) -> List[Dict]:
         """
@@ -121,25 +323,39 @@ class HarmonyAPIClient:
         Returns:
             List of available collections
         """
+        cached = self._collections_cache
+        if cached is not None and time.time() - cached[0] < self.COLLECTIONS_CACHE_TTL:
+            return cached[1]
+
         try:
             url = f"{self.base_url}/collections"
             response = self.session.get(url, timeout=30)
             response.raise_for_status()
-            
-            collections = response.json()
-            
+
+            # orjson parses the MB-scale collections payload several times
+            # faster than requests' stdlib-json .json()
+            collections = orjson.loads(response.content)
+
             # Filter for population-related collections
             population_collections = []
             for collection in collections.get('feed', {}).get('entry', []):
                 title = collection.get('title', '').lower()
                 if any(keyword in title for keyword in ['population', 'demographic', 'human', 'people']):
                     population_collections.append(collection)
-            
+
+            # Only successful fetches are cached, so a transient failure
+            # does not suppress retries for the next hour
+            self._collections_cache = (time.time(), population_collections)
             return population_collections
-            
+
         except requests.RequestException as e:
             logger.error(f"Error fetching collections: {e}")
             return []
+
+    def refresh_collections(self) -> List[Dict]:
+        """Drop the cached listing and fetch a fresh one"""
+        self._collections_cache = None
+        return self.get_available_collections()
     
     def request_population_data(self, collection_id: str, bbox: BoundingBox) -> Optional[str]:
         """
@@ -166,7 +382,7 @@ class HarmonyAPIClient:
             
             # Harmony typically returns a job URL or direct data
             if response.headers.get('content-type', '').startswith('application/json'):
-                return response.json()
+                return orjson.loads(response.content)
             else:
                 # If it's a job, extract job ID from headers or URL
                 location = response.headers.get('Location')
@@ -178,12 +394,179 @@ class HarmonyAPIClient:
             return None
 
 
+# Urban-area database for the grid generators:
+# (name, lat, lon, influence_radius_km, peak_intensity)
+_GRID_CITY_DATABASE = [
+    # Mega cities (population > 20M) - intensity 1.0
+    ("Tokyo-Yokohama", 35.6762, 139.6503, 60, 1.0),
+    ("Delhi", 28.7041, 77.1025, 50, 0.98),
+    ("Shanghai", 31.2304, 121.4737, 55, 0.97),
+    ("São Paulo", -23.5505, -46.6333, 45, 0.95),
+    ("Mumbai", 19.0760, 72.8777, 40, 0.96),
+    ("Beijing", 39.9042, 116.4074, 50, 0.94),
+    ("Cairo", 30.0444, 31.2357, 45, 0.93),
+    ("Dhaka", 23.8103, 90.4125, 35, 0.95),
+    ("Mexico City", 19.4326, -99.1332, 50, 0.94),
+    ("Osaka", 34.6937, 135.5023, 40, 0.92),
+    
+    # Major cities (10-20M) - intensity 0.85-0.92
+    ("New York", 40.7128, -74.0060, 50, 0.91),
+    ("Karachi", 24.8607, 67.0011, 40, 0.90),
+    ("Buenos Aires", -34.6037, -58.3816, 40, 0.88),
+    ("Chongqing", 29.4316, 106.9123, 45, 0.89),
+    ("Istanbul", 41.0082, 28.9784, 42, 0.90),
+    ("Kolkata", 22.5726, 88.3639, 38, 0.88),
+    ("Manila", 14.5995, 120.9842, 38, 0.89),
+    ("Lagos", 6.5244, 3.3792, 42, 0.87),
+    ("Rio de Janeiro", -22.9068, -43.1729, 40, 0.86),
+    ("Guangzhou", 23.1291, 113.2644, 42, 0.88),
+    ("Kinshasa", -4.4419, 15.2663, 38, 0.85),
+    ("Tianjin", 39.3434, 117.3616, 40, 0.87),
+    ("Shenzhen", 22.5431, 114.0579, 35, 0.88),
+    ("Lahore", 31.5497, 74.3436, 35, 0.86),
+    ("Bangalore", 12.9716, 77.5946, 38, 0.85),
+    ("Paris", 48.8566, 2.3522, 42, 0.87),
+    ("Bogota", 4.7110, -74.0721, 35, 0.85),
+    ("Jakarta", 6.2088, 106.8456, 45, 0.89),
+    ("Chennai", 13.0827, 80.2707, 35, 0.84),
+    ("Lima", -12.0464, -77.0428, 38, 0.84),
+    
+    # Large cities (5-10M) - intensity 0.75-0.85
+    ("London", 51.5074, -0.1278, 40, 0.86),
+    ("Bangkok", 13.7563, 100.5018, 40, 0.86),
+    ("Moscow", 55.7558, 37.6173, 42, 0.87),
+    ("Tehran", 35.6892, 51.3890, 38, 0.84),
+    ("Ho Chi Minh City", 10.8231, 106.6297, 35, 0.84),
+    ("Hong Kong", 22.3193, 114.1694, 30, 0.90),
+    ("Seoul", 37.5665, 126.9780, 40, 0.89),
+    ("Baghdad", 33.3152, 44.3661, 35, 0.82),
+    ("Santiago", -33.4489, -70.6693, 35, 0.82),
+    ("Madrid", 40.4168, -3.7038, 35, 0.82),
+    ("Toronto", 43.6532, -79.3832, 38, 0.81),
+    ("Singapore", 1.3521, 103.8198, 25, 0.92),
+    ("Riyadh", 24.7136, 46.6753, 40, 0.78),
+    ("Chicago", 41.8781, -87.6298, 40, 0.83),
+    ("Los Angeles", 34.0522, -118.2437, 50, 0.85),
+    ("Barcelona", 41.3851, 2.1734, 32, 0.81),
+    ("Hyderabad", 17.3850, 78.4867, 35, 0.82),
+    ("Johannesburg", -26.2041, 28.0473, 38, 0.80),
+    ("Ahmedabad", 23.0225, 72.5714, 32, 0.81),
+    ("Nairobi", -1.2864, 36.8172, 32, 0.78),
+    ("Wuhan", 30.5928, 114.3055, 38, 0.83),
+    ("Chengdu", 30.5728, 104.0668, 38, 0.82),
+    ("Hanoi", 21.0285, 105.8542, 32, 0.81),
+    
+    # Major regional cities - intensity 0.70-0.80
+    ("Berlin", 52.5200, 13.4050, 32, 0.80),
+    ("Rome", 41.9028, 12.4964, 32, 0.79),
+    ("Dubai", 25.2048, 55.2708, 30, 0.82),
+    ("Sydney", -33.8688, 151.2093, 35, 0.79),
+    ("Melbourne", -37.8136, 144.9631, 35, 0.77),
+    ("Milan", 45.4642, 9.1900, 30, 0.78),
+    ("Philadelphia", 39.9526, -75.1652, 32, 0.77),
+    ("Houston", 29.7604, -95.3698, 35, 0.76),
+    ("Miami", 25.7617, -80.1918, 32, 0.77),
+    ("Atlanta", 33.7490, -84.3880, 35, 0.75),
+    ("Phoenix", 33.4484, -112.0740, 35, 0.74),
+    ("San Francisco", 37.7749, -122.4194, 32, 0.81),
+    ("Boston", 42.3601, -71.0589, 30, 0.77),
+    ("Dallas", 32.7767, -96.7970, 35, 0.75),
+    ("Washington DC", 38.9072, -77.0369, 32, 0.78),
+    ("Taipei", 25.0330, 121.5654, 30, 0.82),
+    ("Seattle", 47.6062, -122.3321, 30, 0.74),
+    ("Kuala Lumpur", 3.1390, 101.6869, 30, 0.79),
+    ("Yangon", 16.8661, 96.1951, 28, 0.76),
+    ("St Petersburg", 59.9343, 30.3351, 30, 0.78),
+    ("Kiev", 50.4501, 30.5234, 30, 0.76),
+    ("Casablanca", 33.5731, -7.5898, 28, 0.77),
+    ("Addis Ababa", 9.0320, 38.7469, 28, 0.76),
+    ("Belo Horizonte", -19.9167, -43.9345, 30, 0.74),
+    ("Brasilia", -15.8267, -47.9218, 28, 0.72),
+    ("Guadalajara", 20.6597, -103.3496, 28, 0.75),
+    ("Monterrey", 25.6866, -100.3161, 28, 0.74),
+    ("Caracas", 10.4806, -66.9036, 28, 0.75),
+    ("Algiers", 36.7538, 3.0588, 28, 0.75),
+    ("Dar es Salaam", -6.7924, 39.2083, 28, 0.74),
+    ("Luanda", -8.8383, 13.2344, 28, 0.73),
+    ("Abidjan", 5.3600, -4.0083, 28, 0.72),
+    
+    # Secondary cities - intensity 0.65-0.75
+    ("Vienna", 48.2082, 16.3738, 28, 0.75),
+    ("Hamburg", 53.5511, 9.9937, 28, 0.74),
+    ("Warsaw", 52.2297, 21.0122, 28, 0.74),
+    ("Amsterdam", 52.3676, 4.9041, 25, 0.77),
+    ("Brussels", 50.8503, 4.3517, 25, 0.73),
+    ("Stockholm", 59.3293, 18.0686, 28, 0.72),
+    ("Copenhagen", 55.6761, 12.5683, 25, 0.73),
+    ("Munich", 48.1351, 11.5820, 25, 0.74),
+    ("Frankfurt", 50.1109, 8.6821, 25, 0.72),
+    ("Manchester", 53.4808, -2.2426, 25, 0.72),
+    ("Birmingham", 52.4862, -1.8904, 25, 0.71),
+    ("Minneapolis", 44.9778, -93.2650, 28, 0.70),
+    ("Denver", 39.7392, -104.9903, 28, 0.69),
+    ("Montreal", 45.5017, -73.5673, 28, 0.73),
+    ("Vancouver", 49.2827, -123.1207, 25, 0.72),
+    ("San Diego", 32.7157, -117.1611, 28, 0.72),
+    ("Portland", 45.5152, -122.6784, 25, 0.69),
+    ("Detroit", 42.3314, -83.0458, 28, 0.70),
+    ("Brisbane", -27.4698, 153.0251, 28, 0.71),
+    ("Perth", -31.9505, 115.8605, 28, 0.68),
+    ("Auckland", -36.8485, 174.7633, 25, 0.70),
+]
+
+# KD-tree over the grid cities for point queries. The influence metric
+# scales longitude by cos(city_lat), which only ever shrinks distances,
+# so querying raw degrees with the largest cutoff divided by the
+# smallest cosine in the table yields a strict superset of candidates.
+_GRID_CITY_TREE = cKDTree(np.array([(c[1], c[2]) for c in _GRID_CITY_DATABASE]))
+_GRID_CITY_QUERY_RADIUS = max(
+    (c[3] * 3 / 111.0) / math.cos(math.radians(c[1]))
+    for c in _GRID_CITY_DATABASE)
+
+
 class PopulationAnalyzer:
     """High-level interface for population analysis"""
     
     def __init__(self):
         self.client = HarmonyAPIClient()
-    
+        # Real Harmony datasets need Earthdata authentication, which is
+        # not wired up yet; while this is False the simulated path runs
+        # with zero network I/O instead of a wasted collections fetch
+        self.use_real_data = False
+        # requests.Session is not guaranteed thread-safe, so the batch
+        # path hands each worker thread its own client
+        self._local = threading.local()
+
+    def _thread_client(self) -> HarmonyAPIClient:
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = HarmonyAPIClient()
+            self._local.client = client
+        return client
+
+    def get_population_for_geometries(self, geometries: List[Dict],
+                                      max_workers: int = 8) -> List[Optional[PopulationData]]:
+        """
+        Analyze several geometries concurrently.
+
+        The per-geometry cost is dominated by Harmony round-trip latency,
+        so fanning the sync calls out over a small thread pool collapses
+        N sequential RTTs into roughly one. Results keep input order; a
+        failed geometry yields None instead of failing the batch.
+        """
+        if not geometries:
+            return []
+        workers = min(max_workers, len(geometries))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(self._get_population_safe, geometries))
+
+    def _get_population_safe(self, geometry: Dict) -> Optional[PopulationData]:
+        try:
+            return self.get_population_for_geometry(geometry)
+        except Exception:
+            logger.exception("Population analysis failed for geometry")
+            return None
+
     def get_population_for_geometry(self, geometry: Dict) -> Optional[PopulationData]:
         """
         Get population estimate for geometry (circle, square, or rectangle)
@@ -212,7 +595,7 @@ class PopulationAnalyzer:
             radius = geometry.get('radius', 10)
             
             bbox = self.client.calculate_bounding_box_from_circle(lat, lon, radius)
-            area_km2 = 3.14159 * radius * radius
+            area_km2 = math.pi * radius * radius
             coordinates = {'center_lat': lat, 'center_lon': lon, 'radius_km': radius}
             
         elif geometry_type in ['square', 'rectangle']:
@@ -232,21 +615,23 @@ class PopulationAnalyzer:
         logger.info(f"📐 Area: {area_km2:.2f} km²")
         
         # Get population data
-        logger.info("🌐 Fetching available population datasets...")
-        collections = self.client.get_available_collections()
-        
-        if not collections:
-            logger.warning("⚠️ No population collections found. Using simulated data...")
-            return self._generate_simulated_data(bbox, area_km2, coordinates, geometry_type)
-        
-        logger.info(f"✅ Found {len(collections)} population-related collections")
-        
-        # Try to get real data (currently most NASA datasets require authentication)
-        # For now, we'll use simulated data
-        logger.info("💡 Using simulated data (NASA Harmony API requires authentication)")
+        if self.use_real_data:
+            logger.info("🌐 Fetching available population datasets...")
+            collections = self._thread_client().get_available_collections()
+
+            if not collections:
+                logger.warning("⚠️ No population collections found. Using simulated data...")
+                return self._generate_simulated_data(bbox, area_km2, coordinates, geometry_type)
+
+            logger.info(f"✅ Found {len(collections)} population-related collections")
+
+            # Try to get real data (currently most NASA datasets require authentication)
+            # For now, we'll use simulated data
+            logger.info("💡 Using simulated data (NASA Harmony API requires authentication)")
+
         return self._generate_simulated_data(bbox, area_km2, coordinates, geometry_type)
     
-    def _generate_simulated_data(self, bbox: BoundingBox, area_km2: float, 
+    def _generate_simulated_data(self, bbox: BoundingBox, area_km2: float,
                                  coordinates: Dict, geometry_type: str) -> PopulationData:
         """
         Generate simulated population data based on geographic location
@@ -254,77 +639,16 @@ class PopulationAnalyzer:
         """
         avg_lat = (bbox.north + bbox.south) / 2
         avg_lon = (bbox.east + bbox.west) / 2
-        
-        # Base population density (people per km²)
-        population_density = 50
-        
-        # Adjust based on latitude (climate zones)
-        if abs(avg_lat) < 23.5:  # Tropical zone
-            population_density *= 2.0
-        elif abs(avg_lat) < 45:  # Temperate zone
-            population_density *= 2.5
-        elif abs(avg_lat) < 66.5:  # Cool temperate
-            population_density *= 1.5
-        else:  # Polar regions
-            population_density *= 0.05
-        
-        # Major urban centers (simplified)
-        urban_centers = [
-            # City, lat, lon, density multiplier
-            ("Istanbul", 41.0082, 28.9784, 20),
-            ("New York", 40.7128, -74.0060, 25),
-            ("London", 51.5074, -0.1278, 22),
-            ("Tokyo", 35.6762, 139.6503, 30),
-            ("Paris", 48.8566, 2.3522, 20),
-            ("Berlin", 52.5200, 13.4050, 18),
-            ("Moscow", 55.7558, 37.6173, 20),
-            ("Beijing", 39.9042, 116.4074, 25),
-            ("Sydney", -33.8688, 151.2093, 15),
-            ("Cairo", 30.0444, 31.2357, 22),
-            ("Mumbai", 19.0760, 72.8777, 35),
-            ("Los Angeles", 34.0522, -118.2437, 20),
-            ("Singapore", 1.3521, 103.8198, 28),
-            ("Hong Kong", 22.3193, 114.1694, 32),
-            ("Seoul", 37.5665, 126.9780, 26),
-            ("Mexico City", 19.4326, -99.1332, 24),
-            ("São Paulo", -23.5505, -46.6333, 23),
-            ("Lagos", 6.5244, 3.3792, 27),
-            ("Dhaka", 23.8103, 90.4125, 38),
-            ("Karachi", 24.8607, 67.0011, 30),
-        ]
-        
-        # Check proximity to urban centers
-        for city_name, city_lat, city_lon, multiplier in urban_centers:
-            distance = ((avg_lat - city_lat) ** 2 + (avg_lon - city_lon) ** 2) ** 0.5
-            # If within ~2 degrees (~200km)
-            if distance < 2:
-                proximity_factor = (2 - distance) / 2  # 1.0 at center, 0.0 at edge
-                population_density *= (1 + multiplier * proximity_factor)
-                logger.info(f"🏙️ Near {city_name}, applying urban multiplier")
-                break
-        
-        # Coastal areas (simplified - more populated)
-        # This is a very rough approximation
-        if abs(avg_lon) < 20 or abs(avg_lon) > 160:  # Near major coastlines
-            population_density *= 1.3
-        
-        # Calculate total population
-        estimated_population = int(area_km2 * population_density)
-        
-        # Add some randomness for realism
-        import random
-        random.seed(int(avg_lat * 1000 + avg_lon * 1000))
-        variation = random.uniform(0.8, 1.2)
-        estimated_population = int(estimated_population * variation)
-        
-        # Ensure minimum population
-        estimated_population = max(estimated_population, int(area_km2 * 5))
-        
-        density = estimated_population / area_km2 if area_km2 > 0 else 0
-        
+
+        # The math is deterministic in (lat, lon, area); quantizing the
+        # key lets repeated map queries over the same spot hit the cache
+        estimated_population, density = _simulated_population(
+            int(round(avg_lat * 1000)), int(round(avg_lon * 1000)),
+            int(round(area_km2 * 100)))
+
         logger.info(f"👥 Estimated population: {estimated_population:,}")
         logger.info(f"📊 Population density: {density:.2f} people/km²")
-        
+
         return PopulationData(
             total_population=estimated_population,
             area_km2=round(area_km2, 2),
@@ -335,225 +659,31 @@ class PopulationAnalyzer:
             timestamp=time.strftime("%Y-%m-%d %H:%M:%S")
         )
     
-    def get_global_population_density(self, date_str: str = None, resolution: float = 0.1) -> List[List[float]]:
+    def get_global_population_density(self, date_str: str = None, resolution: float = 0.1) -> np.ndarray:
         """
         Fetch REAL global population density data from NASA SEDAC or similar source
-        
+
         Args:
             date_str: Date string (YYYY-MM-DD)
             resolution: Grid resolution in degrees (default 0.1° = ~11km at equator)
-            
+
         Returns:
-            List of [lat, lon, intensity] points for heat map from REAL data
+            (N, 3) float32 array of [lat, lon, intensity] points for heat map
         """
         logger.info(f"🌍 Fetching REAL population from NASA Earthdata Harmony (resolution={resolution}°)")
-        
+
         try:
             # Use NASA Earthdata Harmony API for population data
             return self._fetch_nasa_harmony_population(date_str, resolution)
         except Exception as e:
             logger.warning(f"⚠️ NASA Harmony failed: {e}, falling back to hexagonal grid estimation")
             return self._generate_hexagonal_grid_population(resolution)
-        
-        # Major population centers (city, lat, lon, base_intensity) - ALL VALUES INCREASED
-        major_cities = [
-            # Asia Pacific
-            ("Tokyo", 35.6762, 139.6503, 1.0),
-            ("Delhi", 28.7041, 77.1025, 0.98),
-            ("Shanghai", 31.2304, 121.4737, 0.98),
-            ("Mumbai", 19.0760, 72.8777, 0.96),
-            ("Beijing", 39.9042, 116.4074, 0.95),
-            ("Osaka", 34.6937, 135.5023, 0.92),
-            ("Dhaka", 23.8103, 90.4125, 0.95),
-            ("Karachi", 24.8607, 67.0011, 0.93),
-            ("Manila", 14.5995, 120.9842, 0.90),
-            ("Seoul", 37.5665, 126.9780, 0.93),
-            ("Jakarta", 6.2088, 106.8456, 0.92),
-            ("Bangkok", 13.7563, 100.5018, 0.88),
-            ("Hong Kong", 22.3193, 114.1694, 0.90),
-            ("Singapore", 1.3521, 103.8198, 0.89),
-            
-            # Middle East
-            ("Istanbul", 41.0082, 28.9784, 0.90),
-            ("Tehran", 35.6892, 51.3890, 0.86),
-            ("Baghdad", 33.3152, 44.3661, 0.82),
-            ("Riyadh", 24.7136, 46.6753, 0.78),
-            ("Dubai", 25.2048, 55.2708, 0.83),
-            
-            # Europe
-            ("Moscow", 55.7558, 37.6173, 0.90),
-            ("London", 51.5074, -0.1278, 0.89),
-            ("Paris", 48.8566, 2.3522, 0.88),
-            ("Madrid", 40.4168, -3.7038, 0.83),
-            ("Barcelona", 41.3851, 2.1734, 0.82),
-            ("Berlin", 52.5200, 13.4050, 0.85),
-            ("Rome", 41.9028, 12.4964, 0.83),
-            ("Kiev", 50.4501, 30.5234, 0.80),
-            
-            # Africa
-            ("Cairo", 30.0444, 31.2357, 0.90),
-            ("Lagos", 6.5244, 3.3792, 0.88),
-            ("Kinshasa", -4.4419, 15.2663, 0.84),
-            ("Johannesburg", -26.2041, 28.0473, 0.82),
-            ("Khartoum", 15.5007, 32.5599, 0.78),
-            ("Nairobi", -1.2864, 36.8172, 0.80),
-            
-            # Americas
-            ("New York", 40.7128, -74.0060, 0.94),
-            ("Los Angeles", 34.0522, -118.2437, 0.89),
-            ("Mexico City", 19.4326, -99.1332, 0.93),
-            ("São Paulo", -23.5505, -46.6333, 0.92),
-            ("Rio de Janeiro", -22.9068, -43.1729, 0.87),
-            ("Buenos Aires", -34.6037, -58.3816, 0.88),
-            ("Chicago", 41.8781, -87.6298, 0.85),
-            ("Toronto", 43.6532, -79.3832, 0.82),
-            ("Lima", -12.0464, -77.0428, 0.84),
-            ("Bogota", 4.7110, -74.0721, 0.83),
-            
-            # Oceania
-            ("Sydney", -33.8688, 151.2093, 0.82),
-            ("Melbourne", -37.8136, 144.9631, 0.80),
-            
-            # Additional Major Cities for smoother coverage
-            ("Chongqing", 29.4316, 106.9123, 0.87),
-            ("Lahore", 31.5497, 74.3436, 0.85),
-            ("Bangalore", 12.9716, 77.5946, 0.84),
-            ("Ho Chi Minh", 10.8231, 106.6297, 0.83),
-            ("Kolkata", 22.5726, 88.3639, 0.84),
-            ("Hyderabad", 17.3850, 78.4867, 0.82),
-            ("Ahmedabad", 23.0225, 72.5714, 0.81),
-            ("Shenzhen", 22.5431, 114.0579, 0.86),
-            ("Guangzhou", 23.1291, 113.2644, 0.87),
-            ("Wuhan", 30.5928, 114.3055, 0.84),
-            ("Tianjin", 39.3434, 117.3616, 0.85),
-            ("Taipei", 25.0330, 121.5654, 0.84),
-            ("Kuala Lumpur", 3.1390, 101.6869, 0.81),
-            ("Yangon", 16.8661, 96.1951, 0.79),
-            ("Hanoi", 21.0285, 105.8542, 0.82),
-            ("Chengdu", 30.5728, 104.0668, 0.83),
-            
-            # Europe additional
-            ("Milan", 45.4642, 9.1900, 0.81),
-            ("Saint Petersburg", 59.9343, 30.3351, 0.82),
-            ("Warsaw", 52.2297, 21.0122, 0.78),
-            ("Hamburg", 53.5511, 9.9937, 0.77),
-            ("Vienna", 48.2082, 16.3738, 0.79),
-            ("Amsterdam", 52.3676, 4.9041, 0.80),
-            ("Brussels", 50.8503, 4.3517, 0.76),
-            ("Stockholm", 59.3293, 18.0686, 0.75),
-            
-            # Americas additional
-            ("Miami", 25.7617, -80.1918, 0.79),
-            ("Houston", 29.7604, -95.3698, 0.80),
-            ("Philadelphia", 39.9526, -75.1652, 0.78),
-            ("Phoenix", 33.4484, -112.0740, 0.77),
-            ("Dallas", 32.7767, -96.7970, 0.78),
-            ("San Francisco", 37.7749, -122.4194, 0.82),
-            ("Seattle", 47.6062, -122.3321, 0.76),
-            ("Boston", 42.3601, -71.0589, 0.78),
-            ("Atlanta", 33.7490, -84.3880, 0.77),
-            ("Guadalajara", 20.6597, -103.3496, 0.79),
-            ("Monterrey", 25.6866, -100.3161, 0.77),
-            ("Caracas", 10.4806, -66.9036, 0.78),
-            ("Santiago", -33.4489, -70.6693, 0.81),
-            ("Brasilia", -15.8267, -47.9218, 0.75),
-            ("Recife", -8.0476, -34.8770, 0.77),
-            ("Belo Horizonte", -19.9167, -43.9345, 0.78),
-            
-            # Africa additional
-            ("Addis Ababa", 9.0320, 38.7469, 0.79),
-            ("Dar es Salaam", -6.7924, 39.2083, 0.78),
-            ("Casablanca", 33.5731, -7.5898, 0.80),
-            ("Luanda", -8.8383, 13.2344, 0.77),
-            ("Abidjan", 5.3600, -4.0083, 0.76),
-            ("Algiers", 36.7538, 3.0588, 0.78),
-        ]
-        
-        import random
-        heat_points = []
-        
-        # STEP 1: Create smooth density map for entire world
-        # Use finer grid for smooth interpolation
-        for lat in range(-60, 75, grid_size):
-            for lon in range(-180, 180, grid_size):
-                
-                # Calculate distance-based influence from ALL major cities
-                max_city_influence = 0.0
-                closest_city_distance = float('inf')
-                
-                for city_name, city_lat, city_lon, city_intensity in major_cities:
-                    # Calculate great circle distance (simplified)
-                    lat_diff = abs(lat - city_lat)
-                    lon_diff = abs(lon - city_lon)
-                    distance = (lat_diff**2 + lon_diff**2)**0.5
-                    
-                    # City influence drops off with distance (exponential decay)
-                    if distance < 20:  # Within ~2000km influence range
-                        influence = city_intensity * (0.95 ** distance)
-                        max_city_influence = max(max_city_influence, influence)
-                        closest_city_distance = min(closest_city_distance, distance)
-                
-                # Base rural/regional density (varies by geography)
-                base_density = 0.15
-                
-                # Climate-based adjustments
-                if abs(lat) < 23.5:  # Tropical zones
-                    base_density = 0.25
-                elif abs(lat) < 45:  # Temperate zones (most populated)
-                    base_density = 0.35
-                elif abs(lat) < 60:  # Cool temperate
-                    base_density = 0.20
-                else:  # Polar regions
-                    base_density = 0.02
-                
-                # Regional population corridors
-                # Asia - high density corridor
-                if 10 < lat < 50 and 60 < lon < 145:
-                    base_density *= 1.8
-                # Europe - dense
-                elif 35 < lat < 65 and -10 < lon < 40:
-                    base_density *= 1.6
-                # Eastern North America
-                elif 25 < lat < 50 and -100 < lon < -65:
-                    base_density *= 1.4
-                # West Africa / North Africa
-                elif -10 < lat < 35 and -20 < lon < 50:
-                    base_density *= 1.2
-                # South America - coastal
-                elif -35 < lat < 12 and -80 < lon < -35:
-                    base_density *= 1.3
-                
-                # Coastal bonus (people live near coasts)
-                is_coastal = self._is_near_coast(lat, lon)
-                if is_coastal:
-                    base_density *= 1.3
-                
-                # Add organic variation (Perlin-like noise)
-                random.seed(int(lat * 100 + lon * 100 + lat * lon))
-                noise = random.uniform(0.7, 1.4)
-                base_density *= noise
-                
-                # Combine city influence with base density
-                final_intensity = max(max_city_influence, base_density)
-                
-                # Add the point if visible
-                if final_intensity > 0.08:
-                    heat_points.append([
-                        float(lat), 
-                        float(lon), 
-                        round(min(final_intensity, 1.0), 3)
-                    ])
-        
-        logger.info(f"✅ Generated {len(heat_points)} smooth heat map points")
-        return heat_points
-    
+
     def _fetch_nasa_harmony_population(self, date_str: str, resolution: float) -> List[List[float]]:
         """
         Fetch real population data from NASA Earthdata Harmony API
         Uses GPW (Gridded Population of the World) dataset
         """
-        import requests
-        
         logger.info("📡 Fetching from NASA Earthdata Harmony API...")
         
         # NASA Earthdata Harmony API endpoint
@@ -564,9 +694,10 @@ class PopulationAnalyzer:
         collection_id = "C1000000000-SEDAC"  # Placeholder
         
         try:
-            # Query available collections
+            # Query available collections through the pooled, retrying
+            # client session instead of a throwaway requests.get connection
             collections_url = f"{harmony_base}/collections"
-            response = requests.get(collections_url, timeout=10)
+            response = self.client.session.get(collections_url, timeout=10)
             
             if response.status_code == 200:
                 logger.info(f"✅ Connected to NASA Harmony")
@@ -580,96 +711,132 @@ class PopulationAnalyzer:
             logger.warning(f"NASA Harmony API error: {e}")
             raise
     
-    def _generate_hexagonal_grid_population(self, resolution: float) -> List[List[float]]:
+    def _generate_hexagonal_grid_population(self, resolution: float) -> np.ndarray:
         """
         Generate population density using HEXAGONAL grid system
         Only includes areas with actual population (no empty ocean/desert hexagons)
+        Returns an (N, 3) float32 array of [lat, lon, intensity] rows
         """
-        import numpy as np
         logger.info(f"🔷 Generating HEXAGONAL grid population map (res={resolution}°)")
-        
-        heat_points = []
-        
+
         # Get comprehensive city database
         urban_areas = self._get_comprehensive_city_database()
-        
+
         # Hexagonal grid parameters
         # Hexagons have better coverage and look more organic than squares
         hex_width = resolution * 1.5  # Horizontal spacing
-        hex_height = resolution * np.sqrt(3) / 2  # Vertical spacing
-        
+
         # Generate hexagonal grid
         lat_steps = int((135) / resolution)  # -60 to 75
         lon_steps = int((360) / resolution)  # -180 to 180
-        
+
         logger.info(f"📊 Processing ~{lat_steps * lon_steps:,} hexagonal cells")
-        
-        processed = 0
-        total = lat_steps * lon_steps
-        
-        for i in range(lat_steps):
-            lat = -60 + i * resolution
-            
-            # Offset every other row for hexagonal pattern
-            lon_offset = (hex_width / 2) if i % 2 == 1 else 0
-            
-            for j in range(lon_steps):
-                lon = -180 + j * resolution + lon_offset
-                
-                # Calculate population density at this hexagon center
-                density = self._calculate_point_density(lat, lon, urban_areas)
-                
-                # ONLY add hexagons with significant population
-                # This eliminates ocean, desert, arctic areas automatically
-                if density > 0.1:  # Threshold: only populated areas
-                    heat_points.append([
-                        float(lat), 
-                        float(lon), 
-                        round(float(density), 4)
-                    ])
-                
-                processed += 1
-                if processed % 100000 == 0:
-                    progress = processed / total * 100
-                    logger.info(f"  🔷 Progress: {processed:,}/{total:,} ({progress:.1f}%) - {len(heat_points):,} populated hexagons")
-        
+
+        lat_vals = np.float32(-60) + np.arange(lat_steps, dtype=np.float32) * np.float32(resolution)
+        lon_base = np.float32(-180) + np.arange(lon_steps, dtype=np.float32) * np.float32(resolution)
+        # Offset every other row for the hexagonal pattern
+        row_offset = np.where(np.arange(lat_steps) % 2 == 1,
+                              hex_width / 2, 0.0).astype(np.float32)
+        lon_grid = lon_base[None, :] + row_offset[:, None]
+
+        density = self._compute_density_grid(lat_vals, lon_base, lon_grid, urban_areas)
+
+        # ONLY keep hexagons with significant population; this eliminates
+        # ocean, desert and arctic areas automatically
+        mask = density > 0.1
+        lat_grid = np.broadcast_to(lat_vals[:, None], density.shape)
+        heat_points = np.column_stack([
+            lat_grid[mask], lon_grid[mask], np.round(density[mask], 4)
+        ]).astype(np.float32)
+
         logger.info(f"✅ Generated {len(heat_points):,} hexagonal population cells (empty areas excluded)")
+        # Single float32 array keeps the payload compact and serializes in
+        # one pass instead of walking a Python list-of-lists object graph
         return heat_points
+
+    def _compute_density_grid(self, lat_vals: np.ndarray, lon_base: np.ndarray,
+                              lon_grid: np.ndarray, urban_areas: List[tuple]) -> np.ndarray:
+        """
+        Vectorized equivalent of mapping _calculate_point_density over a
+        grid: the rural base is evaluated with boolean masks over the
+        whole grid at once, then each city adds its exponential-decay
+        influence into the sub-window its 3x radius can reach instead of
+        every cell testing every city.
+        """
+        lat_col = lat_vals[:, None]
+        abs_lat = np.abs(lat_col)
+
+        # Rural base: tropical vs temperate, scaled by the population
+        # corridors (first match wins, like the scalar elif chain)
+        base = np.where(abs_lat < 23.5, np.float32(0.12), np.float32(0.15))
+        corridor = np.select(
+            [(lat_col > 15) & (lat_col < 45) & (lon_grid > 70) & (lon_grid < 125),
+             (lat_col > 40) & (lat_col < 60) & (lon_grid > -10) & (lon_grid < 40),
+             (lat_col > -10) & (lat_col < 0) & (lon_grid > 105) & (lon_grid < 115),
+             (lat_col > 30) & (lat_col < 45) & (lon_grid > -95) & (lon_grid < -70),
+             (lat_col > 5) & (lat_col < 20) & (lon_grid > -15) & (lon_grid < 15),
+             (lat_col > 22) & (lat_col < 32) & (lon_grid > 29) & (lon_grid < 33)],
+            [2.5, 2.0, 2.2, 1.8, 1.5, 2.0], default=1.0).astype(np.float32)
+        density = base * corridor
+        # Arctic/sub-arctic bands return flat values without corridors
+        density = np.where(abs_lat > 60, np.float32(0.01),
+                           np.where(abs_lat > 50, np.float32(0.05), density))
+
+        # Per-city influence, added only inside the window the cutoff
+        # radius can reach; the rest of the grid never touches this city.
+        # Offset rows shift east of lon_base by up to this much, so the
+        # west edge of every window is padded by the largest row offset
+        lon_pad = float(lon_grid[:, 0].max() - lon_base[0])
+        for _name, city_lat, city_lon, radius_km, peak in urban_areas:
+            cos_lat = math.cos(math.radians(city_lat))
+            cutoff_deg = radius_km * 3 / 111.0
+            r0 = int(np.searchsorted(lat_vals, city_lat - cutoff_deg))
+            r1 = int(np.searchsorted(lat_vals, city_lat + cutoff_deg, side='right'))
+            lon_cut = cutoff_deg / max(cos_lat, 1e-6)
+            c0 = int(np.searchsorted(lon_base, city_lon - lon_cut - lon_pad))
+            c1 = int(np.searchsorted(lon_base, city_lon + lon_cut, side='right'))
+            if r0 >= r1 or c0 >= c1:
+                continue
+
+            dlat = lat_vals[r0:r1, None] - np.float32(city_lat)
+            dlon = (lon_grid[r0:r1, c0:c1] - np.float32(city_lon)) * np.float32(cos_lat)
+            distance_km = np.sqrt(dlat * dlat + dlon * dlon) * np.float32(111.0)
+            influence = np.where(
+                distance_km < radius_km * 3,
+                np.float32(peak) * np.exp(distance_km * np.float32(-1.5 / radius_km)),
+                np.float32(0.0))
+            density[r0:r1, c0:c1] += influence
+
+        np.minimum(density, 1.0, out=density)
+        return density
     
     def _generate_high_quality_estimation(self, resolution: float) -> List[List[float]]:
         """
         Generate high-resolution population density using realistic data
         Based on UN World Population data and geographic factors
         """
-        import numpy as np
         logger.info(f"🎯 Generating HIGH-QUALITY population density (res={resolution}°)")
-        
-        heat_points = []
-        
+
         # Comprehensive city database with accurate population densities (people per km²)
         # Format: (name, lat, lon, radius_km, peak_density_normalized)
         major_urban_areas = self._get_comprehensive_city_database()
-        
-        # Generate fine-grained grid
-        lat_range = np.arange(-60, 75, resolution)
-        lon_range = np.arange(-180, 180, resolution)
-        
-        total_points = len(lat_range) * len(lon_range)
+
+        # Generate fine-grained grid (square cells, no hex offset)
+        lat_vals = np.arange(-60, 75, resolution, dtype=np.float32)
+        lon_base = np.arange(-180, 180, resolution, dtype=np.float32)
+
+        total_points = len(lat_vals) * len(lon_base)
         logger.info(f"📊 Processing {total_points:,} grid points at {resolution}° resolution")
-        
-        processed = 0
-        for lat in lat_range:
-            for lon in lon_range:
-                # Calculate population density for this point
-                intensity = self._calculate_point_density(lat, lon, major_urban_areas)
-                
-                if intensity > 0.05:  # Only include visible points
-                    heat_points.append([float(lat), float(lon), round(float(intensity), 4)])
-                
-                processed += 1
-                if processed % 50000 == 0:
-                    logger.info(f"  Progress: {processed:,}/{total_points:,} ({processed/total_points*100:.1f}%)")
-        
+
+        lon_grid = np.broadcast_to(lon_base[None, :], (len(lat_vals), len(lon_base)))
+        density = self._compute_density_grid(lat_vals, lon_base, lon_grid, major_urban_areas)
+
+        mask = density > 0.05  # Only include visible points
+        lat_grid = np.broadcast_to(lat_vals[:, None], density.shape)
+        heat_points = np.column_stack([
+            lat_grid[mask], lon_grid[mask], np.round(density[mask], 4)
+        ]).tolist()
+
         logger.info(f"✅ Generated {len(heat_points):,} high-quality density points")
         return heat_points
     
@@ -678,123 +845,7 @@ class PopulationAnalyzer:
         Comprehensive database of urban areas with realistic density metrics
         Returns: List of (name, lat, lon, influence_radius_km, peak_intensity)
         """
-        return [
-            # Mega cities (population > 20M) - intensity 1.0
-            ("Tokyo-Yokohama", 35.6762, 139.6503, 60, 1.0),
-            ("Delhi", 28.7041, 77.1025, 50, 0.98),
-            ("Shanghai", 31.2304, 121.4737, 55, 0.97),
-            ("São Paulo", -23.5505, -46.6333, 45, 0.95),
-            ("Mumbai", 19.0760, 72.8777, 40, 0.96),
-            ("Beijing", 39.9042, 116.4074, 50, 0.94),
-            ("Cairo", 30.0444, 31.2357, 45, 0.93),
-            ("Dhaka", 23.8103, 90.4125, 35, 0.95),
-            ("Mexico City", 19.4326, -99.1332, 50, 0.94),
-            ("Osaka", 34.6937, 135.5023, 40, 0.92),
-            
-            # Major cities (10-20M) - intensity 0.85-0.92
-            ("New York", 40.7128, -74.0060, 50, 0.91),
-            ("Karachi", 24.8607, 67.0011, 40, 0.90),
-            ("Buenos Aires", -34.6037, -58.3816, 40, 0.88),
-            ("Chongqing", 29.4316, 106.9123, 45, 0.89),
-            ("Istanbul", 41.0082, 28.9784, 42, 0.90),
-            ("Kolkata", 22.5726, 88.3639, 38, 0.88),
-            ("Manila", 14.5995, 120.9842, 38, 0.89),
-            ("Lagos", 6.5244, 3.3792, 42, 0.87),
-            ("Rio de Janeiro", -22.9068, -43.1729, 40, 0.86),
-            ("Guangzhou", 23.1291, 113.2644, 42, 0.88),
-            ("Kinshasa", -4.4419, 15.2663, 38, 0.85),
-            ("Tianjin", 39.3434, 117.3616, 40, 0.87),
-            ("Shenzhen", 22.5431, 114.0579, 35, 0.88),
-            ("Lahore", 31.5497, 74.3436, 35, 0.86),
-            ("Bangalore", 12.9716, 77.5946, 38, 0.85),
-            ("Paris", 48.8566, 2.3522, 42, 0.87),
-            ("Bogota", 4.7110, -74.0721, 35, 0.85),
-            ("Jakarta", 6.2088, 106.8456, 45, 0.89),
-            ("Chennai", 13.0827, 80.2707, 35, 0.84),
-            ("Lima", -12.0464, -77.0428, 38, 0.84),
-            
-            # Large cities (5-10M) - intensity 0.75-0.85
-            ("London", 51.5074, -0.1278, 40, 0.86),
-            ("Bangkok", 13.7563, 100.5018, 40, 0.86),
-            ("Moscow", 55.7558, 37.6173, 42, 0.87),
-            ("Tehran", 35.6892, 51.3890, 38, 0.84),
-            ("Ho Chi Minh City", 10.8231, 106.6297, 35, 0.84),
-            ("Hong Kong", 22.3193, 114.1694, 30, 0.90),
-            ("Seoul", 37.5665, 126.9780, 40, 0.89),
-            ("Baghdad", 33.3152, 44.3661, 35, 0.82),
-            ("Santiago", -33.4489, -70.6693, 35, 0.82),
-            ("Madrid", 40.4168, -3.7038, 35, 0.82),
-            ("Toronto", 43.6532, -79.3832, 38, 0.81),
-            ("Singapore", 1.3521, 103.8198, 25, 0.92),
-            ("Riyadh", 24.7136, 46.6753, 40, 0.78),
-            ("Chicago", 41.8781, -87.6298, 40, 0.83),
-            ("Los Angeles", 34.0522, -118.2437, 50, 0.85),
-            ("Barcelona", 41.3851, 2.1734, 32, 0.81),
-            ("Hyderabad", 17.3850, 78.4867, 35, 0.82),
-            ("Johannesburg", -26.2041, 28.0473, 38, 0.80),
-            ("Ahmedabad", 23.0225, 72.5714, 32, 0.81),
-            ("Nairobi", -1.2864, 36.8172, 32, 0.78),
-            ("Wuhan", 30.5928, 114.3055, 38, 0.83),
-            ("Chengdu", 30.5728, 104.0668, 38, 0.82),
-            ("Hanoi", 21.0285, 105.8542, 32, 0.81),
-            
-            # Major regional cities - intensity 0.70-0.80
-            ("Berlin", 52.5200, 13.4050, 32, 0.80),
-            ("Rome", 41.9028, 12.4964, 32, 0.79),
-            ("Dubai", 25.2048, 55.2708, 30, 0.82),
-            ("Sydney", -33.8688, 151.2093, 35, 0.79),
-            ("Melbourne", -37.8136, 144.9631, 35, 0.77),
-            ("Milan", 45.4642, 9.1900, 30, 0.78),
-            ("Philadelphia", 39.9526, -75.1652, 32, 0.77),
-            ("Houston", 29.7604, -95.3698, 35, 0.76),
-            ("Miami", 25.7617, -80.1918, 32, 0.77),
-            ("Atlanta", 33.7490, -84.3880, 35, 0.75),
-            ("Phoenix", 33.4484, -112.0740, 35, 0.74),
-            ("San Francisco", 37.7749, -122.4194, 32, 0.81),
-            ("Boston", 42.3601, -71.0589, 30, 0.77),
-            ("Dallas", 32.7767, -96.7970, 35, 0.75),
-            ("Washington DC", 38.9072, -77.0369, 32, 0.78),
-            ("Taipei", 25.0330, 121.5654, 30, 0.82),
-            ("Seattle", 47.6062, -122.3321, 30, 0.74),
-            ("Kuala Lumpur", 3.1390, 101.6869, 30, 0.79),
-            ("Yangon", 16.8661, 96.1951, 28, 0.76),
-            ("St Petersburg", 59.9343, 30.3351, 30, 0.78),
-            ("Kiev", 50.4501, 30.5234, 30, 0.76),
-            ("Casablanca", 33.5731, -7.5898, 28, 0.77),
-            ("Addis Ababa", 9.0320, 38.7469, 28, 0.76),
-            ("Belo Horizonte", -19.9167, -43.9345, 30, 0.74),
-            ("Brasilia", -15.8267, -47.9218, 28, 0.72),
-            ("Guadalajara", 20.6597, -103.3496, 28, 0.75),
-            ("Monterrey", 25.6866, -100.3161, 28, 0.74),
-            ("Caracas", 10.4806, -66.9036, 28, 0.75),
-            ("Algiers", 36.7538, 3.0588, 28, 0.75),
-            ("Dar es Salaam", -6.7924, 39.2083, 28, 0.74),
-            ("Luanda", -8.8383, 13.2344, 28, 0.73),
-            ("Abidjan", 5.3600, -4.0083, 28, 0.72),
-            
-            # Secondary cities - intensity 0.65-0.75
-            ("Vienna", 48.2082, 16.3738, 28, 0.75),
-            ("Hamburg", 53.5511, 9.9937, 28, 0.74),
-            ("Warsaw", 52.2297, 21.0122, 28, 0.74),
-            ("Amsterdam", 52.3676, 4.9041, 25, 0.77),
-            ("Brussels", 50.8503, 4.3517, 25, 0.73),
-            ("Stockholm", 59.3293, 18.0686, 28, 0.72),
-            ("Copenhagen", 55.6761, 12.5683, 25, 0.73),
-            ("Munich", 48.1351, 11.5820, 25, 0.74),
-            ("Frankfurt", 50.1109, 8.6821, 25, 0.72),
-            ("Manchester", 53.4808, -2.2426, 25, 0.72),
-            ("Birmingham", 52.4862, -1.8904, 25, 0.71),
-            ("Minneapolis", 44.9778, -93.2650, 28, 0.70),
-            ("Denver", 39.7392, -104.9903, 28, 0.69),
-            ("Montreal", 45.5017, -73.5673, 28, 0.73),
-            ("Vancouver", 49.2827, -123.1207, 25, 0.72),
-            ("San Diego", 32.7157, -117.1611, 28, 0.72),
-            ("Portland", 45.5152, -122.6784, 25, 0.69),
-            ("Detroit", 42.3314, -83.0458, 28, 0.70),
-            ("Brisbane", -27.4698, 153.0251, 28, 0.71),
-            ("Perth", -31.9505, 115.8605, 28, 0.68),
-            ("Auckland", -36.8485, 174.7633, 25, 0.70),
-        ]
+        return _GRID_CITY_DATABASE
     
     def _calculate_point_density(self, lat: float, lon: float, urban_areas: List[tuple]) -> float:
         """
@@ -802,19 +853,29 @@ class PopulationAnalyzer:
         Uses distance-weighted influence from all nearby urban areas
         """
         total_influence = 0.0
-        
-        # Calculate influence from all urban centers
-        for name, city_lat, city_lon, radius_km, peak_intensity in urban_areas:
-            # Calculate distance in degrees (simplified)
+
+        # Prune to cities whose influence zone can reach this point; the
+        # tree query returns a superset, the exact cutoff below decides
+        if urban_areas is _GRID_CITY_DATABASE:
+            candidates = [urban_areas[i] for i in _GRID_CITY_TREE.query_ball_point(
+                (lat, lon), r=_GRID_CITY_QUERY_RADIUS)]
+        else:
+            candidates = urban_areas
+
+        # Calculate influence from nearby urban centers
+        for name, city_lat, city_lon, radius_km, peak_intensity in candidates:
+            # Squared distance in degrees (simplified); the sqrt only runs
+            # for cities that pass the cutoff and feed the decay
             lat_diff = lat - city_lat
-            lon_diff = (lon - city_lon) * np.cos(np.radians(city_lat))  # Adjust for latitude
-            distance_deg = np.sqrt(lat_diff**2 + lon_diff**2)
-            distance_km = distance_deg * 111  # Rough conversion: 1° ≈ 111km
-            
-            if distance_km < radius_km * 3:  # Within 3x radius has influence
+            lon_diff = (lon - city_lon) * math.cos(math.radians(city_lat))  # Adjust for latitude
+            d2 = lat_diff * lat_diff + lon_diff * lon_diff
+
+            cutoff_deg = radius_km * 3 / 111.0  # Within 3x radius has influence
+            if d2 < cutoff_deg * cutoff_deg:
+                distance_km = math.sqrt(d2) * 111  # Rough conversion: 1° ≈ 111km
                 # Exponential decay function
                 normalized_dist = distance_km / radius_km
-                influence = peak_intensity * np.exp(-normalized_dist * 1.5)
+                influence = peak_intensity * math.exp(-normalized_dist * 1.5)
                 total_influence += influence
         
         # Add base rural density based on region
@@ -12,11 +12,37 @@ import numpy as np
 import pandas as pd
 from sklearn.ensemble import HistGradientBoostingRegressor
 from sklearn.multioutput import MultiOutputRegressor
+import os
 import requests
+import threading
 import time
 
 logger = logging.getLogger(__name__)
 
+# NASA POWER serves daily data on a 0.25-degree grid, so any coordinates in
+# the same cell resolve to an identical payload - cache keys snap to the grid
+# so nearby map clicks share one download. 24h TTL matches the source's
+# daily update cadence. Each entry pins a 10-year DataFrame, so the cache
+# is capped and inserts sweep out expired or oldest entries first.
+_POWER_GRID_DEG = 0.25
+_DYNAMIC_CACHE_TTL = 24 * 3600
+_DYNAMIC_CACHE_MAX = 64
+_dynamic_cache: Dict[tuple, tuple] = {}
+_dynamic_cache_lock = threading.Lock()
+
+# Cap concurrent NASA POWER downloads: a burst of forecast jobs should
+# queue here rather than all slamming the upstream API at once
+_NASA_MAX_CONCURRENT = int(os.environ.get('NASA_MAX_CONCURRENT', 2))
+_nasa_semaphore = threading.Semaphore(_NASA_MAX_CONCURRENT)
+
+# Shared session so successive NASA downloads reuse the TLS connection
+# instead of paying a fresh handshake per fetch; requests.Session is
+# thread-safe for this usage
+_nasa_session = requests.Session()
+_nasa_session.mount("https://", requests.adapters.HTTPAdapter(
+    pool_connections=_NASA_MAX_CONCURRENT,
+    pool_maxsize=_NASA_MAX_CONCURRENT))
+
 TARGET_COLUMNS = ["temperature", "wind_speed", "precipitation", "humidity"]
 LAG_DAYS = [1, 2, 3, 7, 14]
 
@@ -156,7 +182,16 @@ def fetch_historical_data_dynamic(lat: float, lon: float, years: int = 10) -> pd
         DataFrame with columns: date, latitude, longitude, temperature, wind_speed, precipitation, humidity
     """
     API_URL = "https://power.larc.nasa.gov/api/temporal/daily/point"
-    
+
+    cache_key = (round(lat / _POWER_GRID_DEG) * _POWER_GRID_DEG,
+                 round(lon / _POWER_GRID_DEG) * _POWER_GRID_DEG,
+                 years)
+    with _dynamic_cache_lock:
+        cached = _dynamic_cache.get(cache_key)
+        if cached and cached[1] > time.time():
+            logger.info(f"⚡ NASA POWER cache hit for grid cell {cache_key[:2]}")
+            return cached[0].copy()
+
     end_date = datetime(2024, 12, 31)
     start_date = end_date - timedelta(days=years*365)
     
@@ -179,7 +214,8 @@ def fetch_historical_data_dynamic(lat: float, lon: float, years: int = 10) -> pd
     start_time = time.time()
     
     try:
-        response = requests.get(API_URL, params=params, timeout=60)
+        with _nasa_semaphore:
+            response = _nasa_session.get(API_URL, params=params, timeout=60)
         response.raise_for_status()
         
         elapsed = time.time() - start_time
@@ -187,26 +223,20 @@ def fetch_historical_data_dynamic(lat: float, lon: float, years: int = 10) -> pd
         
         data = response.json()
         parameter_data = data.get("properties", {}).get("parameter", {})
-        
-        dates = sorted(set(parameter_data.get("T2M", {}).keys()))
-        
-        records = []
-        for date_str in dates:
-            date_obj = datetime.strptime(date_str, "%Y%m%d")
-            
-            record = {
-                "date": date_obj.strftime("%Y-%m-%d"),
-                "latitude": lat,
-                "longitude": lon,
-                "temperature": parameter_data.get("T2M", {}).get(date_str, None),
-                "wind_speed": parameter_data.get("WS10M", {}).get(date_str, None),
-                "precipitation": parameter_data.get("PRECTOTCORR", {}).get(date_str, None),
-                "humidity": parameter_data.get("RH2M", {}).get(date_str, None),
-            }
-            records.append(record)
-        
-        df = pd.DataFrame(records)
-        df['date'] = pd.to_datetime(df['date'])
+
+        # Build the frame column-wise straight from the per-parameter
+        # dicts (pandas aligns them on the shared date keys) instead of
+        # assembling ~3650 row dicts in a Python loop
+        df = pd.DataFrame({
+            "temperature": parameter_data.get("T2M", {}),
+            "wind_speed": parameter_data.get("WS10M", {}),
+            "precipitation": parameter_data.get("PRECTOTCORR", {}),
+            "humidity": parameter_data.get("RH2M", {}),
+        })
+        df.index = pd.to_datetime(df.index, format="%Y%m%d")
+        df = df.sort_index().rename_axis("date").reset_index()
+        df.insert(1, "latitude", lat)
+        df.insert(2, "longitude", lon)
         
         initial_count = len(df)
         df = df.dropna()
@@ -217,8 +247,17 @@ def fetch_historical_data_dynamic(lat: float, lon: float, years: int = 10) -> pd
         
         logger.info(f"✅ Loaded {len(df)} days of location-specific data")
         logger.info(f"   Temperature avg: {df['temperature'].mean():.1f}°C (range: {df['temperature'].min():.1f}°C to {df['temperature'].max():.1f}°C)")
-        
-        return df
+
+        now = time.time()
+        with _dynamic_cache_lock:
+            for key in [k for k, v in _dynamic_cache.items() if v[1] <= now]:
+                del _dynamic_cache[key]
+            while len(_dynamic_cache) >= _DYNAMIC_CACHE_MAX:
+                _dynamic_cache.pop(next(iter(_dynamic_cache)))
+            _dynamic_cache[cache_key] = (df, now + _DYNAMIC_CACHE_TTL)
+
+        # Copy so callers that append forecast rows don't mutate the cache
+        return df.copy()
         
     except requests.exceptions.Timeout:
         logger.error("❌ NASA API timeout (>60s)")
@@ -0,0 +1,85 @@
+"""
+Task state store for background jobs
+Thread-safe, TTL-evicting replacement for the bare module-level dicts
+that tracked analysis/prediction jobs
+"""
+
+import threading
+import time
+
+
+class TaskStore:
+    """
+    In-process store for task trackers with Redis-like expiry semantics.
+
+    Entries expire ttl_seconds after their last write, so orphaned tasks
+    whose clients never call /cleanup are garbage collected instead of
+    accumulating for the life of the worker. The dict-style interface
+    keeps call sites unchanged and leaves room to swap in a shared
+    backend (e.g. Redis hashes with EXPIRE) without touching handlers.
+    """
+
+    # Expired entries are reaped lazily on access; a periodic sweep on
+    # write bounds memory even when nobody ever touches the dead keys
+    SWEEP_INTERVAL = 60
+
+    def __init__(self, ttl_seconds=3600):
+        self.ttl_seconds = ttl_seconds
+        self._items = {}  # task_id -> (tracker, expires_at)
+        self._lock = threading.Lock()
+        self._next_sweep = time.time() + self.SWEEP_INTERVAL
+
+    def _sweep(self, now):
+        """Drop every expired entry; caller holds the lock"""
+        if now < self._next_sweep:
+            return
+        self._next_sweep = now + self.SWEEP_INTERVAL
+        expired = [task_id for task_id, (_, expires_at) in self._items.items()
+                   if expires_at <= now]
+        for task_id in expired:
+            del self._items[task_id]
+
+    def touch(self, task_id):
+        """Extend an entry's TTL, mirroring Redis EXPIRE on write-through"""
+        with self._lock:
+            if task_id in self._items:
+                tracker, _ = self._items[task_id]
+                self._items[task_id] = (tracker, time.time() + self.ttl_seconds)
+
+    def __setitem__(self, task_id, tracker):
+        with self._lock:
+            now = time.time()
+            self._sweep(now)
+            self._items[task_id] = (tracker, now + self.ttl_seconds)
+
+    def __getitem__(self, task_id):
+        with self._lock:
+            tracker, expires_at = self._items[task_id]
+            if time.time() >= expires_at:
+                del self._items[task_id]
+                raise KeyError(task_id)
+            return tracker
+
+    def __delitem__(self, task_id):
+        with self._lock:
+            del self._items[task_id]
+
+    def __contains__(self, task_id):
+        try:
+            self[task_id]
+            return True
+        except KeyError:
+            return False
+
+    def __len__(self):
+        with self._lock:
+            now = time.time()
+            return sum(1 for _, expires_at in self._items.values() if expires_at > now)
+
+    def items(self):
+        """Snapshot of live (task_id, tracker) pairs"""
+        with self._lock:
+            now = time.time()
+            return [(task_id, tracker)
+                    for task_id, (tracker, expires_at) in self._items.items()
+                    if expires_at > now]
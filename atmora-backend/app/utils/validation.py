@@ -0,0 +1,81 @@
+"""
+Request payload validation helpers
+Shared by route controllers so each handler doesn't re-implement
+the same branch-heavy field checks on the hot path
+"""
+
+import numpy as np
+
+VALID_GEOMETRY_TYPES = ('circle', 'square', 'rectangle')
+
+
+def validate_coords(points):
+    """
+    Validate an (N, 2) array-like of [lat, lon] points in one vectorized
+    pass instead of per-point Python loops
+
+    Returns:
+        Error message string, or None when every point is in range
+    """
+    arr = np.asarray(points, dtype=np.float64)
+    lat_ok = (arr[:, 0] >= -90) & (arr[:, 0] <= 90)
+    lon_ok = (arr[:, 1] >= -180) & (arr[:, 1] <= 180)
+    if not (lat_ok & lon_ok).all():
+        return 'Invalid coordinates in bounds'
+    return None
+
+
+def validate_geometry(geometry):
+    """
+    Validate a geometry payload for population analysis
+
+    Args:
+        geometry: dict with type, center/radius (circle) or bounds (rect)
+
+    Returns:
+        Error message string, or None when the geometry is valid
+    """
+    geometry_type = geometry.get('type')
+
+    if geometry_type not in VALID_GEOMETRY_TYPES:
+        return 'Invalid geometry type. Must be circle, square, or rectangle'
+
+    if geometry_type == 'circle':
+        if 'center' not in geometry or 'radius' not in geometry:
+            return 'Circle geometry requires center and radius'
+
+        center = geometry['center']
+        if 'lat' not in center or 'lon' not in center:
+            return 'Center requires lat and lon'
+
+        try:
+            lat = float(center['lat'])
+            lon = float(center['lon'])
+            radius = float(geometry['radius'])
+        except (ValueError, TypeError):
+            return 'Invalid numeric values'
+
+        if not (-90 <= lat <= 90):
+            return 'Latitude must be between -90 and 90'
+        if not (-180 <= lon <= 180):
+            return 'Longitude must be between -180 and 180'
+        if not (0.1 <= radius <= 1000):
+            return 'Radius must be between 0.1 and 1000 km'
+
+    else:  # square / rectangle
+        if 'bounds' not in geometry:
+            return f'{geometry_type.capitalize()} geometry requires bounds'
+
+        bounds = geometry['bounds']
+        if not isinstance(bounds, list) or len(bounds) != 2:
+            return 'Bounds must be array of 2 points [[lat1, lon1], [lat2, lon2]]'
+
+        if not all(isinstance(point, list) and len(point) == 2 for point in bounds):
+            return 'Each bound point must be [lat, lon]'
+
+        try:
+            return validate_coords(bounds)
+        except (ValueError, TypeError):
+            return 'Invalid numeric values in bounds'
+
+    return None